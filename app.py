@@ -1,51 +1,272 @@
+import functools
+import json
+import math
+import os
+import threading
+import time
+
+# Taken before the Dash/pandas/plotly imports below, which are most of the
+# startup time; reported with the warm-up as dashboard_startup_seconds.
+started = time.monotonic()
+
 from dash import dash_table
 import dash
-from dash import dcc, html, Input, Output
+from dash import dcc, html, ClientsideFunction, Input, Output, Patch, State
 import dash_bootstrap_components as dbc
+import numpy as np
 import pandas as pd
+from flask import Response, request
 import plotly.express as px
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.io.json import to_json_plotly
 
-app = dash.Dash(__name__, external_stylesheets=[
-    dbc.themes.LUX,
-    "https://cdn.jsdelivr.net/npm/bootstrap-icons@1.10.5/font/bootstrap-icons.css",
-    "https://cdnjs.cloudflare.com/ajax/libs/animate.css/4.1.1/animate.min.css"  
-])
+import datastore
+import metrics
+import prerender
+import profiling
+from table_query import table_page
+from render_cache import RenderCache
+
+# The LUX theme, Bootstrap Icons and animate.css are bundled under assets/vendor/
+# (loaded automatically by Dash), so the app needs no CDN access.
+app = dash.Dash(__name__, compress=True)
 
 app.title = "Damon Runyon Dashboard | SOPHIA"
+server = app.server
 
-# Load Data
-excel_file = 'assets/damon_runyon_data_CLEAN.xlsx'
-funding_df = pd.read_excel(excel_file, sheet_name='NIH & Grant Funding Impact')
-awards_df = pd.read_excel(excel_file, sheet_name='Awards & Recognitions')
-publications_df = pd.read_excel(excel_file, sheet_name='Publications (ICite #)')
-publications_impact_df = pd.read_excel(excel_file, sheet_name='Publications Impact')
 
-scientists = funding_df[funding_df.columns[0]].dropna().unique()
+@server.after_request
+def cache_static_assets(response):
+    # Dash links assets as /assets/<file>?m=<mtime> and bootstrap-icons.css links
+    # its fonts with a content hash, so a fingerprinted URL never changes content.
+    if request.path.startswith(app.get_asset_url('')) and request.query_string and response.status_code == 200:
+        response.cache_control.no_cache = None
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+    return response
 
-# Load Overview-specific data
-notable_df = pd.read_excel(excel_file, sheet_name="Companies Summary")[
-    ["Scientist", "Current Academic Position", "Notable Awards", "High-Impact Publications (#)",
-     "Total Funding Raised by Companies", "IPOs / Acquisitions"]
-].dropna(how="all")
 
-timeline_data = pd.read_excel(excel_file, sheet_name="NIH & Grant Funding Impact")[[
-    "Scientist Name", "Award Start Date", "Time to First NIH Grant (Post-Damon Runyon Award)"
-]].copy()
+server.after_request(metrics.add_server_timing)
 
-timeline_data["Award Start Date"] = pd.to_datetime(timeline_data["Award Start Date"], errors="coerce")
-timeline_data["NIH Months"] = timeline_data["Time to First NIH Grant (Post-Damon Runyon Award)"].str.extract(r"(\d+)").astype(float)
 
-import plotly.express as px
-timeline_fig_overview = px.bar(
-    timeline_data,
-    x="NIH Months",
-    y="Scientist Name",
-    orientation="h",
-    title="Time to First NIH Grant (Months)",
-    labels={"NIH Months": "Months to First NIH Grant"},
-    color="Scientist Name"
+@server.route("/metrics")
+def prometheus_metrics():
+    body, content_type = metrics.exposition()
+    return Response(body, content_type=content_type)
+
+
+@server.route("/healthz")
+def healthz():
+    # Liveness: the process is up and serving, whether or not the data is loaded.
+    return {"status": "ok"}
+
+
+@server.route("/readyz")
+def readyz():
+    # Readiness: the workbook is loaded and the pages are pre-rendered, so the
+    # first visitor does not pay for the warm-up.
+    if not warmed_up.is_set() or not dataset.ready:
+        return {"status": "loading"}, 503
+    return {"status": "ready", "version": dataset.current.version[:12]}
+
+
+profiling.install(app)
+
+# Load Data
+excel_file = os.environ.get("DASHBOARD_WORKBOOK", 'assets/damon_runyon_data_CLEAN.xlsx')
+# Loaded by warm_up() below (or by the first request that needs it), so the
+# server can answer /healthz while the workbook is read.
+dataset = datastore.DatasetManager(excel_file, lazy=True)
+dataset.watch(float(os.environ.get("DASHBOARD_RELOAD_INTERVAL", "10")))
+
+render_cache = RenderCache(
+    version=lambda: dataset.current.version,
+    maxsize=int(os.environ.get("DASHBOARD_RENDER_CACHE_SIZE", "256")),
+    ttl=float(os.environ.get("DASHBOARD_RENDER_CACHE_TTL", "600"))
 )
-timeline_fig_overview.update_layout(height=500, margin=dict(l=100, r=40, t=50, b=50), showlegend=False)
+# Entries for the old version would only sit there, holding its Dataset, until evicted.
+dataset.on_reload(lambda ds: render_cache.clear())
+
+# When set, the Publications, Impact and Awards pages ship their data to the
+# browser once and filter in assets/clientside.js instead of calling the server.
+CLIENTSIDE_FILTERING = os.environ.get("DASHBOARD_CLIENTSIDE_FILTERING") == "1"
+
+# Scatter charts switch from SVG to WebGL above WEBGL_POINTS points, and above
+# DENSITY_POINTS are aggregated on the server so payload and draw time stay bounded.
+WEBGL_POINTS = int(os.environ.get("DASHBOARD_WEBGL_POINTS", "1000"))
+DENSITY_POINTS = int(os.environ.get("DASHBOARD_DENSITY_POINTS", "10000"))
+DENSITY_BINS = 60
+
+
+def filter_callback(*args, **kwargs):
+    """app.callback for server-side filters that clientside mode replaces."""
+    if CLIENTSIDE_FILTERING:
+        return lambda func: func
+    return app.callback(*args, **kwargs)
+
+
+# When set, heavy views run as Dash background callbacks: a job in a separate
+# process with a disk-backed result cache, so request threads stay free.
+BACKGROUND_CALLBACKS = os.environ.get("DASHBOARD_BACKGROUND_CALLBACKS") == "1"
+
+if BACKGROUND_CALLBACKS:
+    import diskcache
+    import psutil
+
+    class BackgroundManager(dash.DiskcacheManager):
+        def terminate_job(self, job):
+            # Concurrent requests with the same inputs share one cached result,
+            # and the other jobs may exit between Dash's pid check and kill.
+            try:
+                super().terminate_job(job)
+            except psutil.NoSuchProcess:
+                pass
+
+        def call_job_fn(self, key, job_fn, args, context):
+            # A fork taken while the warm-up thread is importing a plotly module
+            # leaves that module's import lock held in the job, which then hangs.
+            warmed_up.wait()
+            return super().call_job_fn(key, job_fn, args, context)
+
+    background_manager = BackgroundManager(
+        diskcache.Cache(os.environ.get("DASHBOARD_BACKGROUND_CACHE_DIR", ".background-cache")),
+        # Finished results are reused for the same inputs and dataset version.
+        cache_by=[lambda: dataset.current.version],
+        expire=int(os.environ.get("DASHBOARD_RENDER_CACHE_TTL", "600"))
+    )
+
+
+def no_progress(progress):
+    pass
+
+
+def background_callback(outputs, inputs, progress, running, clientside_replaced=False):
+    """app.callback for heavy views, run as a background job when
+    BACKGROUND_CALLBACKS is set. The function takes ``set_progress`` first in
+    both modes. A new trigger cancels the job still running for the old
+    inputs, and so does leaving the page."""
+    def decorator(func):
+        if clientside_replaced and CLIENTSIDE_FILTERING:
+            return func
+        if BACKGROUND_CALLBACKS:
+            return app.callback(outputs, inputs, background=True, manager=background_manager, interval=250,
+                                progress=progress, running=running, cancel=[Input('url', 'pathname')])(func)
+
+        def callback(*args):
+            return func(no_progress, *args)
+        # Only the name is copied: functools.wraps would also set __wrapped__, and
+        # whatever unwraps it (inspect.signature, say) would find func, which
+        # takes set_progress as well.
+        callback.__name__ = callback.__qualname__ = func.__name__
+        app.callback(outputs, inputs, running=running)(callback)
+        return func
+
+    return decorator
+
+
+def progress_bar(progress_id):
+    """Shown while a background_callback's job runs (see running=)."""
+    return html.Progress(id=progress_id, value="0", max="1", style={'display': 'none', 'width': '100%'})
+
+
+def progress_outputs(progress_id):
+    return dict(
+        progress=[Output(progress_id, 'value'), Output(progress_id, 'max')],
+        running=[(Output(progress_id, 'style'), {'display': 'block', 'width': '100%'}, {'display': 'none'})]
+    )
+
+
+def page_store(store_id, df, columns):
+    """The page's compact dataset as a dcc.Store, in clientside mode only."""
+    if not CLIENTSIDE_FILTERING:
+        return []
+    return [dcc.Store(id=store_id, data={
+        "columns": df[columns].to_dict("list"),
+        "template": pio.templates[pio.templates.default].layout.to_plotly_json(),
+        "limits": {"webgl": WEBGL_POINTS, "density": DENSITY_POINTS, "bins": DENSITY_BINS}
+    })]
+
+
+def table_actions():
+    """DataTable paging/sort/filter props: served page by page from the server
+    unless clientside mode already holds the rows in the browser."""
+    action = 'native' if CLIENTSIDE_FILTERING else 'custom'
+    return dict(page_action=action, sort_action=action, filter_action=action, page_current=0, page_size=10)
+
+
+def layout_only(fig):
+    """A figure's layout without traces, for graphs whose callbacks patch in data."""
+    return go.Figure(layout=fig.layout)
+
+
+def patch_traces(fig):
+    """Patch replacing only the traces of a figure already on the page."""
+    patch = Patch()
+    patch['data'] = fig.to_plotly_json()['data']
+    return patch
+
+
+def render_mode(df):
+    return 'webgl' if len(df) > WEBGL_POINTS else 'svg'
+
+
+def density_traces(df, x, y, label):
+    """A heatmap counting rows in DENSITY_BINS x DENSITY_BINS cells of x and y."""
+    df = df.dropna(subset=[x, y])
+    counts, x_edges, y_edges = np.histogram2d(
+        df[x].to_numpy(dtype=float), df[y].to_numpy(dtype=float), bins=DENSITY_BINS
+    )
+    return go.Figure(go.Heatmap(
+        z=np.where(counts.T > 0, counts.T, np.nan).astype(np.float32),
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        colorscale='Viridis',
+        colorbar=dict(title=dict(text=label)),
+        hovertemplate=f"{x}=%{{x:.1f}}<br>{y}=%{{y:.0f}}<br>{label}=%{{z}}<extra></extra>"
+    ), layout=dict(xaxis_title=x, yaxis_title=y))
+
+
+def awards_heatmap(df):
+    """A heatmap counting awards per year (at most DENSITY_BINS bins) and organization
+    (the DENSITY_BINS with the most awards, the rest summed into "Other")."""
+    df = df.dropna(subset=["Year"])
+    years = df["Year"].to_numpy(dtype=float)
+    organizations = list(datastore.label_counts(df["Organization"]).index[:DENSITY_BINS])
+    codes = pd.Categorical(df["Organization"], categories=organizations).codes
+    if (codes == -1).any():
+        codes = np.where(codes == -1, len(organizations), codes)
+        organizations.append("Other")
+    low, high = years.min(), years.max()
+    # One bin per year while they fit, so the centres are the years themselves.
+    year_edges = np.linspace(low - 0.5, high + 0.5, min(int(high - low) + 1, DENSITY_BINS) + 1)
+    counts, _, _ = np.histogram2d(
+        years, codes, bins=[year_edges, np.arange(len(organizations) + 1) - 0.5]
+    )
+    return go.Figure(go.Heatmap(
+        z=np.where(counts.T > 0, counts.T, np.nan).astype(np.float32),
+        x=(year_edges[:-1] + year_edges[1:]) / 2,
+        y=organizations,
+        colorscale='Viridis',
+        colorbar=dict(title=dict(text="Awards")),
+        hovertemplate="Year=%{x:.0f}<br>Organization=%{y}<br>Awards=%{z}<extra></extra>"
+    ), layout=dict(xaxis_title="Year", yaxis_title="Organization"))
+
+
+@functools.lru_cache(maxsize=2)
+def build_overview_figure(ds):
+    timeline_fig_overview = px.bar(
+        ds.timeline_data,
+        x="NIH Months",
+        y="Scientist Name",
+        orientation="h",
+        title="Time to First NIH Grant (Months)",
+        labels={"NIH Months": "Months to First NIH Grant"},
+        color="Scientist Name"
+    )
+    timeline_fig_overview.update_layout(height=500, margin=dict(l=100, r=40, t=50, b=50), showlegend=False)
+    return timeline_fig_overview
 
 # --- Layout Components ---
 header = dbc.NavbarSimple(
@@ -96,9 +317,57 @@ app.layout = html.Div(
 )
 
 # --- Page Routing Callback ---
+PAGES = ('/', '/publications', '/impact', '/companies', '/awards')
+
+# (dataset version, {pathname: serialized layout}) for the routes in PAGES. Kept
+# out of the render cache, so callback results never evict the pages and they
+# do not expire; a new dataset version starts a new dict.
+page_layouts = (None, {})
+
+
+def page_layout(pathname):
+    """The page in serialized (plain JSON) form, built once per route and dataset
+    version, so a repeat visit skips both building the page and Dash walking the
+    component tree."""
+    global page_layouts
+    version, layouts = page_layouts
+    if version != dataset.current.version:
+        version, layouts = page_layouts = (dataset.current.version, {})
+    layout = layouts.get(pathname)
+    if layout is None:
+        layout = json.loads(to_json_plotly(build_page(pathname)))
+        if pathname in PAGES:
+            layouts[pathname] = layout
+    return layout
+
+
+def build_page_layouts():
+    """Build every route's layout for the current dataset version."""
+    for pathname in PAGES:
+        page_layout(pathname)
+
+
+# A reloaded workbook gets its pages built right away, not by the first visitors.
+dataset.on_reload(lambda ds: build_page_layouts())
+
+
 @app.callback(Output('page-content', 'children'),
               Input('url', 'pathname'))
+@metrics.timed
 def display_page(pathname):
+    return page_layout(pathname)
+
+
+def percent(value):
+    return "–" if pd.isna(value) else f"{value:.0f}%"
+
+
+def build_page(pathname):
+    ds = dataset.current
+    notable_df = ds.notable_df
+    awards_df = ds.awards_df
+    kpis = ds.kpis()
+
     if pathname == '/' or pathname == '':
         return dbc.Container([
             html.Div([
@@ -116,7 +385,7 @@ def display_page(pathname):
                                 html.Div([
                                     html.I(className="bi bi-award-fill", style={"fontSize": "28px", "color": "#4c00b0"}),
                                     html.H6("Received NIH Grants"),
-                                    html.H2("100%"),
+                                    html.H2(percent(kpis["Received NIH Grants %"])),
                                     html.Small("All funded within 3 years", className="text-muted")
                                 ], className="text-center animate__animated animate__fadeInUp")
                             ]),
@@ -129,7 +398,7 @@ def display_page(pathname):
                                 html.Div([
                                     html.I(className="bi bi-building", style={"fontSize": "28px", "color": "#4c00b0"}),
                                     html.H6("Founded Companies"),
-                                    html.H2("19"),
+                                    html.H2(f"{kpis['Companies Founded']}"),
                                     html.Small("Biotech ventures launched", className="text-muted")
                                 ], className="text-center animate__animated animate__fadeInUp")
                             ]),
@@ -142,7 +411,7 @@ def display_page(pathname):
                                 html.Div([
                                     html.I(className="bi bi-capsule", style={"fontSize": "28px", "color": "#4c00b0"}),
                                     html.H6("FDA-Linked Patents"),
-                                    html.H2("1"),
+                                    html.H2(f"{kpis['FDA-Approved Patents']}"),
                                     html.Small("With approved indication", className="text-muted")
                                 ], className="text-center animate__animated animate__fadeInUp")
                             ]),
@@ -155,7 +424,7 @@ def display_page(pathname):
                                 html.Div([
                                     html.I(className="bi bi-person-badge-fill", style={"fontSize": "28px", "color": "#4c00b0"}),
                                     html.H6("Became PIs"),
-                                    html.H2("100%"),
+                                    html.H2(percent(kpis["Academic Positions %"])),
                                     html.Small("Now leading labs", className="text-muted")
                                 ], className="text-center animate__animated animate__fadeInUp")
                             ]),
@@ -167,7 +436,7 @@ def display_page(pathname):
                     dbc.Row([
                         dbc.Col(dbc.Card(dbc.CardBody([
                             html.Div([
-                                html.H2("100%", style={"fontWeight": "bold", "color": "#4c00b0", "fontSize": "28px"}),
+                                html.H2(percent(kpis["Multiple NIH Grants %"]), style={"fontWeight": "bold", "color": "#4c00b0", "fontSize": "28px"}),
                                 html.H6("with multiple NIH grants"),
                                 html.Small("Most secured >1 grant post-award", className="text-muted")
                             ], className="d-flex flex-column align-items-center justify-content-center text-center")
@@ -175,7 +444,7 @@ def display_page(pathname):
 
                         dbc.Col(dbc.Card(dbc.CardBody([
                             html.Div([
-                                html.H2("19", style={"fontWeight": "bold", "color": "#4c00b0", "fontSize": "28px"}),
+                                html.H2(f"{kpis['Companies Founded']}", style={"fontWeight": "bold", "color": "#4c00b0", "fontSize": "28px"}),
                                 html.H6("Companies Launched"),
                                 html.Small("From drug dev to diagnostics", className="text-muted")
                             ], className="d-flex flex-column align-items-center justify-content-center text-center")
@@ -183,7 +452,7 @@ def display_page(pathname):
 
                         dbc.Col(dbc.Card(dbc.CardBody([
                             html.Div([
-                                html.H2("1", style={"fontWeight": "bold", "color": "#4c00b0", "fontSize": "28px"}),
+                                html.H2(f"{kpis['FDA-Approved Patents']}", style={"fontWeight": "bold", "color": "#4c00b0", "fontSize": "28px"}),
                                 html.H6("FDA-Linked Patent"),
                                 html.Small("Resulting in approved therapy", className="text-muted")
                             ], className="d-flex flex-column align-items-center justify-content-center text-center")
@@ -193,14 +462,17 @@ def display_page(pathname):
 
                 # SECTION 4: Timeline Chart
                 html.Div([
-                    dcc.Graph(figure=timeline_fig_overview)
+                    dcc.Graph(figure=build_overview_figure(ds))
                 ], className="animate__animated animate__fadeInUp", style={"paddingTop": "30px", "paddingBottom": "40px"}),
 
                 # SECTION 5: Notable Achievements
                 html.H4("Notable Achievements"),
                 dash_table.DataTable(
-                    data=notable_df.to_dict('records'),
+                    id='notable-table',
                     columns=[{"name": i, "id": i} for i in notable_df.columns],
+                    page_action='custom',
+                    page_current=0,
+                    page_size=10,
                     style_table={"overflowX": "auto"},
                     style_cell={"textAlign": "left", "padding": "6px"},
                     style_header={"fontWeight": "bold", "backgroundColor": "#f0f0f0"}
@@ -218,7 +490,7 @@ def display_page(pathname):
             dcc.Dropdown(
                 id='pubs-scientist-dropdown',
                 options=[{'label': 'All Scientists', 'value': 'All'}] +
-                        [{'label': sci, 'value': sci} for sci in publications_df['Scientist Name']],
+                        [{'label': sci, 'value': sci} for sci in ds.publications_df['Scientist Name']],
                 value='All',
                 style={'width': '50%', 'margin-bottom': '20px', 'position': 'sticky', 'top': '70px', 'zIndex': 1000}
             ),
@@ -248,38 +520,44 @@ def display_page(pathname):
                 ]), color="warning", inverse=True)),
             ], className="mb-4"),
 
-            dcc.Graph(id='top10-chart'),
+            dcc.Graph(id='top10-chart', figure=publication_chart(ds.publications_df, 'top10-chart')),
 
+            # Charts in the accordion are drawn when their item is opened.
             dbc.Accordion([
                 dbc.AccordionItem([
                     dbc.Row([
                         dbc.Col(dcc.Graph(id='pubs-per-year-chart')),
                         dbc.Col(dcc.Graph(id='total-pubs-chart')),
                     ])
-                ], title="Productivity Metrics"),
+                ], title="Productivity Metrics", item_id='productivity'),
 
                 dbc.AccordionItem([
                     dbc.Row([
                         dbc.Col(dcc.Graph(id='weighted-rcr-chart')),
                         dbc.Col(dcc.Graph(id='mean-rcr-chart')),
                     ])
-                ], title="Citation Impact"),
+                ], title="Citation Impact", item_id='citation-impact'),
 
                 dbc.AccordionItem([
                     dbc.Row([
                         dbc.Col(dcc.Graph(id='avg-apt-chart')),
                         dbc.Col(dcc.Graph(id='cited-clin-chart')),
                     ])
-                ], title="Translational Reach"),
-            ], start_collapsed=True),
+                ], title="Translational Reach", item_id='translational-reach'),
+            ], id='pubs-accordion', start_collapsed=True),
 
             dbc.Tooltip("Total number of publications by the selected scientist(s).", target="tooltip-total-pubs", placement="top"),
             dbc.Tooltip("Average number of publications per year.", target="tooltip-avg-pubs-year", placement="top"),
             dbc.Tooltip("Percentage of publications ranked in the top 10% by citations.", target="tooltip-top10", placement="top"),
             dbc.Tooltip("Average weighted Relative Citation Ratio, indicating citation impact.", target="tooltip-avg-rcr", placement="top"),
-        ])
+        ] + page_store('pubs-data', ds.publications_df, [
+            'Scientist Name', 'Total Pubs', 'Pubs Per Year', '% of pubs in Top 10%', 'Weighted RCR',
+            'Count of Pubs in top 10%', 'Mean RCR', 'Avg APT', 'Cited by Clin'
+        ]))
 # --- Page Routing Callback (continued) ---
     elif pathname == '/impact':
+        # The callback fills in the traces; the page only needs the figure layouts.
+        _, bar_fig, scatter_fig = build_impact_figures('All', 10)
         return dbc.Container([
             html.H2("Publications Impact"),
             html.P("Analyzing the impact factors of top publications post-Damon Runyon award."),
@@ -287,7 +565,7 @@ def display_page(pathname):
             dcc.Dropdown(
                 id='impact-scientist-dropdown',
                 options=[{'label': 'All Scientists', 'value': 'All'}] + 
-                        [{'label': sci, 'value': sci} for sci in publications_impact_df['Scientist'].unique()],
+                        [{'label': sci, 'value': sci} for sci in ds.publications_impact_df['Scientist'].unique()],
                 value='All',
                 style={'width': '50%', 'margin-bottom': '20px', 'position': 'sticky', 'top': '70px', 'zIndex': 1000}
             ),
@@ -301,6 +579,7 @@ def display_page(pathname):
                     tooltip={"placement": "bottom", "always_visible": False}
                 )
             ], style={'margin-bottom': '30px'}),
+            progress_bar('impact-progress'),
 
             dbc.Row([
                 dbc.Col(dbc.Card(dbc.CardBody([
@@ -314,7 +593,7 @@ def display_page(pathname):
             dbc.Card([
                 dbc.CardBody([
                     html.H4("Top 10 Publications by Impact Factor", className="card-title"),
-                    dcc.Graph(id='avg-impact-chart')
+                    dcc.Graph(id='avg-impact-chart', figure=layout_only(bar_fig))
                 ])
             ], className="mb-4"),
 
@@ -323,25 +602,21 @@ def display_page(pathname):
             dbc.Card([
                 dbc.CardBody([
                     html.H4("Impact Factor vs. Total Citations", className="card-title"),
-                    dcc.Graph(id='scatter-impact-chart')
+                    dcc.Graph(id='scatter-impact-chart', figure=layout_only(scatter_fig))
                 ])
             ], className="mb-4"),
 
             dbc.Accordion([
                 dbc.AccordionItem([
-                    html.Div(id='impact-table')
+                    html.Div(id='impact-table', children=impact_datatable(id='impact-datatable', **table_actions()))
                 ], title="View Detailed Top Publications"),
             ], start_collapsed=True),
 
         # Tooltips
         dbc.Tooltip("Average journal impact factor for top 5 post-award publications.", target="tooltip-avg-impact", placement="top"),
-    ])
+    ] + page_store('impact-data', ds.publications_impact_df, ['Scientist', 'Title', 'Journal', 'Impact Factor', 'Total Citations', 'Impact Badge']))
 
     elif pathname == '/companies':
-        companies_df = pd.read_excel(excel_file, sheet_name='Companies')
-        summary_df = pd.read_excel(excel_file, sheet_name='Companies Summary')
-        summary_df = summary_df.rename(columns={"Scientist Name": "Scientist"})
-
         return dbc.Container([
             html.H2("Companies & Career Timeline"),
             html.P("Explore company affiliations and career trajectories of Damon Runyon scientists."),
@@ -350,7 +625,7 @@ def display_page(pathname):
                 dbc.Col(dcc.Dropdown(
                     id="companies-scientist-dropdown",
                     options=[{"label": "All Scientists", "value": "All"}] +
-                            [{"label": sci, "value": sci} for sci in sorted(companies_df['Scientist'].unique())],
+                            [{"label": sci, "value": sci} for sci in ds.companies_scientists],
                     value="All",
                     placeholder="Select a Scientist",
                     style={'margin-bottom': '10px'}
@@ -370,6 +645,7 @@ def display_page(pathname):
                 ), width=6),
             ], className="mb-4"),
 
+            progress_bar('companies-progress'),
             html.Div(id="companies-kpi-output"),
             html.Div(id="companies-gantt-output"),
             html.Div(id="companies-table-output")
@@ -377,23 +653,12 @@ def display_page(pathname):
 
     elif pathname == '/awards':
         # KPI Metrics
-        total_awards = len(awards_df)
-        most_awarded_scientist = awards_df['Scientist Name'].value_counts().idxmax()
-        most_common_org = awards_df['Organization'].value_counts().idxmax()
+        total_awards = kpis['Awards']
+        most_awarded_scientist = kpis['Most Awarded Scientist']
+        most_common_org = kpis['Most Common Organization']
 
-        # Timeline Chart
-        timeline_fig = px.scatter(
-            awards_df,
-            x="Year",
-            y="Scientist Name",
-            color="Organization",
-            hover_data=["Awards", "Organization"],
-            title="Awards & Recognitions Timeline"
-        )
-        timeline_fig.update_layout(height=500)
-        
         # Bar Chart: Total Awards per Scientist
-        award_counts = awards_df['Scientist Name'].value_counts().reset_index()
+        award_counts = datastore.label_counts(awards_df['Scientist Name']).reset_index()
         award_counts.columns = ['Scientist Name', 'Award Count']
 
         bar_fig = px.bar(
@@ -434,72 +699,108 @@ def display_page(pathname):
             
             dcc.Graph(figure=bar_fig),
             html.Br(),
-            dcc.Graph(id='awards-scatter', figure=timeline_fig),
+            dcc.Graph(id='awards-scatter', figure=layout_only(build_awards_scatter(ds, 'all'))),
             html.Br(),
 
             dash_table.DataTable(
                 id='awards-table',
                 columns=[{"name": i, "id": i} for i in awards_df.columns],
-                data=awards_df.to_dict('records'),
-                page_size=10,
                 style_table={'overflowX': 'auto'},
-                sort_action="native",
-                filter_action="native",
-                style_cell={'textAlign': 'left'}
+                style_cell={'textAlign': 'left'},
+                **table_actions()
             )
-        ])
+        ] + page_store('awards-data', awards_df, list(awards_df.columns)))
     
     else:
         return html.Div("404 Page Not Found")
 
 # --- Publications Section Callback ---
-@app.callback(
+PUBLICATION_CHARTS = {
+    'top10-chart': ('Count of Pubs in top 10%', 'Publications in Top 10%'),
+    'pubs-per-year-chart': ('Pubs Per Year', 'Publications Per Year'),
+    'total-pubs-chart': ('Total Pubs', 'Total Publications'),
+    'weighted-rcr-chart': ('Weighted RCR', 'Weighted RCR'),
+    'mean-rcr-chart': ('Mean RCR', 'Mean RCR'),
+    'avg-apt-chart': ('Avg APT', 'Average APT'),
+    'cited-clin-chart': ('Cited by Clin', 'Cited by Clinical Articles')
+}
+
+
+# Accordion item -> the charts inside it.
+PUBLICATION_ACCORDION = {
+    'productivity': ('pubs-per-year-chart', 'total-pubs-chart'),
+    'citation-impact': ('weighted-rcr-chart', 'mean-rcr-chart'),
+    'translational-reach': ('avg-apt-chart', 'cited-clin-chart')
+}
+
+
+def publication_chart(df, chart_id):
+    column, title = PUBLICATION_CHARTS[chart_id]
+    return px.bar(df, x='Scientist Name', y=column, title=title)
+
+
+def publications_rows(ds, selected_scientist):
+    if selected_scientist == 'All':
+        return ds.publications_df
+    return ds.for_scientist('publications_df', selected_scientist)
+
+
+def publication_values(df, chart_id):
+    """Patch setting a chart's bars to ``df``, for a chart already on the page."""
+    column, _title = PUBLICATION_CHARTS[chart_id]
+    chart = Patch()
+    chart['data'][0]['x'] = df['Scientist Name'].tolist()
+    chart['data'][0]['y'] = df[column].tolist()
+    return chart
+
+
+@filter_callback(
     [Output('total-pubs', 'children'),
      Output('avg-pubs-year', 'children'),
      Output('top10-pubs', 'children'),
      Output('avg-rcr', 'children'),
-     Output('top10-chart', 'figure'),
-     Output('pubs-per-year-chart', 'figure'),
-     Output('total-pubs-chart', 'figure'),
-     Output('weighted-rcr-chart', 'figure'),
-     Output('mean-rcr-chart', 'figure'),
-     Output('avg-apt-chart', 'figure'),
-     Output('cited-clin-chart', 'figure')],
+     Output('top10-chart', 'figure')],
     [Input('pubs-scientist-dropdown', 'value')]
 )
-
+@metrics.timed
+@render_cache.memoize
 def update_publications_section(selected_scientist):
-    if selected_scientist == 'All':
-        df = publications_df.copy()
-    else:
-        df = publications_impact_df[publications_impact_df['Scientist Name'] == selected_scientist]
+    ds = dataset.current
+    df = publications_rows(ds, selected_scientist)
 
-    total_pubs = df['Total Pubs'].sum()
-    avg_pubs_year = round(df['Pubs Per Year'].mean(), 2)
+    kpis = ds.kpis(selected_scientist)
+    total_pubs = kpis['Total Pubs']
+    avg_pubs_year = round(kpis['Pubs Per Year'], 2)
+    top10_pct = f"{round(kpis['% of pubs in Top 10%'], 1)}%"
+    avg_rcr = round(kpis['Weighted RCR'], 2)
 
-    if df['% of pubs in Top 10%'].dtype == 'O':
-        pct_values = df['% of pubs in Top 10%'].str.replace('%', '').astype(float)
-    else:
-        pct_values = df['% of pubs in Top 10%']
-    top10_pct = f"{round(pct_values.mean(), 1)}%"
-
-    avg_rcr = round(df['Weighted RCR'].mean(), 2)
-
-    charts = {
-        'top10-chart': px.bar(df, x='Scientist Name', y='Count of Pubs in top 10%', title='Publications in Top 10%'),
-        'pubs-per-year-chart': px.bar(df, x='Scientist Name', y='Pubs Per Year', title='Publications Per Year'),
-        'total-pubs-chart': px.bar(df, x='Scientist Name', y='Total Pubs', title='Total Publications'),
-        'weighted-rcr-chart': px.bar(df, x='Scientist Name', y='Weighted RCR', title='Weighted RCR'),
-        'mean-rcr-chart': px.bar(df, x='Scientist Name', y='Mean RCR', title='Mean RCR'),
-        'avg-apt-chart': px.bar(df, x='Scientist Name', y='Avg APT', title='Average APT'),
-        'cited-clin-chart': px.bar(df, x='Scientist Name', y='Cited by Clin', title='Cited by Clinical Articles')
-    }
-
-    return (total_pubs, avg_pubs_year, top10_pct, avg_rcr,
-            charts['top10-chart'], charts['pubs-per-year-chart'],
-            charts['total-pubs-chart'], charts['weighted-rcr-chart'],
-            charts['mean-rcr-chart'], charts['avg-apt-chart'],
-            charts['cited-clin-chart'])
+    # The chart is on the page already; only its x/y values change.
+    return (total_pubs, avg_pubs_year, top10_pct, avg_rcr, publication_values(df, 'top10-chart'))
+
+
+@filter_callback(
+    [Output(chart_id, 'figure') for charts in PUBLICATION_ACCORDION.values() for chart_id in charts],
+    [Input('pubs-scientist-dropdown', 'value'),
+     Input('pubs-accordion', 'active_item')]
+)
+@metrics.timed
+def update_publication_accordion(selected_scientist, active_item):
+    # Only open items are drawn. Opening one sends its whole figure; changing
+    # the scientist patches the open (so already drawn) charts, and closed ones
+    # are redrawn with the current scientist when they are next opened.
+    opened = dash.ctx.triggered_id == 'pubs-accordion'
+    active = set(active_item if isinstance(active_item, list) else [active_item])
+    df = publications_rows(dataset.current, selected_scientist)
+    outputs = []
+    for item, charts in PUBLICATION_ACCORDION.items():
+        for chart_id in charts:
+            if item not in active:
+                outputs.append(dash.no_update)
+            elif opened:
+                outputs.append(publication_chart(df, chart_id))
+            else:
+                outputs.append(publication_values(df, chart_id))
+    return outputs
 
 # --- Publications Impact Section Callback ---
 # Add this inside your `update_impact_section` callback to upgrade the impact section as discussed
@@ -511,44 +812,62 @@ scientist_colors = {
     "Feng Zhang, PhD": "#AB63FA"
 }
 
-@app.callback(
-    [Output('avg-impact', 'children'),
-     Output('avg-impact-chart', 'figure'),
-     Output('scatter-impact-chart', 'figure'),
-     Output('impact-table', 'children')],
-    [Input('impact-scientist-dropdown', 'value'),
-     Input('if-threshold-slider', 'value')]
-)
-def update_impact_section(selected_scientist, if_threshold):
-    if selected_scientist == 'All':
-        df = publications_impact_df.dropna(subset=["Scientist", "Impact Factor", "Total Citations"])
-    else:
-        df = publications_impact_df[(publications_impact_df['Scientist'] == selected_scientist)]
 
-    # Apply the Impact Factor threshold to ALL filtered data
-    df = df[df['Impact Factor'] >= if_threshold]
+def impact_datatable(**kwargs):
+    return dash_table.DataTable(
+        columns=[
+            {"name": "Scientist", "id": "Scientist"},
+            {"name": "Title", "id": "Title"},
+            {"name": "Journal", "id": "Journal"},
+            {"name": "Impact Factor", "id": "Impact Factor"},
+            {"name": "Total Citations", "id": "Total Citations"},
+            {"name": "Impact Badge", "id": "Impact Badge"}
+        ],
+        style_table={'overflowX': 'auto'},
+        style_cell={
+            'textAlign': 'left',
+            'padding': '5px',
+            'minWidth': '100px',
+            'whiteSpace': 'normal'
+        },
+        style_header={
+            'backgroundColor': '#4c00b0',
+            'color': 'white',
+            'fontWeight': 'bold'
+        },
+        style_data_conditional=[
+            {
+                'if': {'filter_query': f'{{Scientist}} = "{sci}"'},
+                'backgroundColor': color,
+                'color': 'white'
+            } for sci, color in scientist_colors.items()
+        ],
+        **kwargs
+    )
+
+def impact_query(ds, selected_scientist, if_threshold):
+    """Publications with Impact Factor >= if_threshold, ranked by Impact Factor,
+    with their count, mean Impact Factor and max citations."""
+    index = ds.impact_index(None if selected_scientist == 'All' else selected_scientist)
+    return index.query(if_threshold)
 
-    # Add the Impact Badge column to ALL data
-    def get_badge(row):
-        badges = []
-        if row['Impact Factor'] > 25:
-            badges.append('🔥 High IF')
-        if row['Total Citations'] > 500:
-            badges.append('📈 Highly Cited')
-        return " | ".join(badges)
 
-    df['Impact Badge'] = df.apply(get_badge, axis=1)
+@render_cache.memoize
+def build_impact_figures(selected_scientist, if_threshold):
+    impact = impact_query(dataset.current, selected_scientist, if_threshold)
+    # Rows ranked by Impact Factor; restore sheet order for the scatter colours.
+    df = impact.rows.sort_index()
 
     # KPI Metrics
-    total_pubs = len(df)
-    avg_if = round(df['Impact Factor'].mean(), 2)
-    most_cited_row = df.loc[df['Total Citations'].idxmax()]
-    most_cited_count = int(most_cited_row['Total Citations'])
+    total_pubs = impact.count
+    # No publications have no mean; the clientside KPI shows the same dash.
+    avg_if = round(impact.mean_impact_factor, 2) if total_pubs else "–"
+    most_cited_count = int(impact.max_citations) if total_pubs else 0
 
     # Bar Chart: Top 10 by Impact Factor — ranked and labeled
-    top10_df = df.sort_values(by='Impact Factor', ascending=False).head(10).copy()
+    top10_df = impact.rows.head(10)
     rank_emojis = ['🥇 1', '🥈 2', '🥉 3'] + [f"{i+1}" for i in range(3, 10)]
-    top10_df['Rank Label'] = rank_emojis
+    top10_df = top10_df.assign(**{'Rank Label': rank_emojis[:len(top10_df)]})
 
     bar_fig = px.bar(
         top10_df,
@@ -581,79 +900,198 @@ def update_impact_section(selected_scientist, if_threshold):
     )
 
     # Scatter Plot: Impact Factor vs Citations
-    scatter_fig = px.scatter(
-        df,
-        x='Impact Factor',
-        y='Total Citations',
-        color='Scientist',
-        hover_data=['Title', 'Journal'],
-        title='Impact Factor vs. Total Citations'
-    )
+    if len(df) > DENSITY_POINTS:
+        scatter_fig = density_traces(df, 'Impact Factor', 'Total Citations', 'Publications')
+        scatter_fig.update_layout(title='Impact Factor vs. Total Citations')
+    else:
+        scatter_fig = px.scatter(
+            df,
+            x='Impact Factor',
+            y='Total Citations',
+            color='Scientist',
+            hover_data=['Title', 'Journal'],
+            title='Impact Factor vs. Total Citations',
+            render_mode=render_mode(df)
+        )
 
-    # Interactive Table
-    table = dash_table.DataTable(
-    data=df[['Scientist', 'Title', 'Journal', 'Impact Factor', 'Total Citations', 'Impact Badge']].to_dict('records'),
-    columns=[
-        {"name": "Scientist", "id": "Scientist"},
-        {"name": "Title", "id": "Title"},
-        {"name": "Journal", "id": "Journal"},
-        {"name": "Impact Factor", "id": "Impact Factor"},
-        {"name": "Total Citations", "id": "Total Citations"},
-        {"name": "Impact Badge", "id": "Impact Badge"}
-    ],
-    style_table={'overflowX': 'auto'},
-    style_cell={
-        'textAlign': 'left',
-        'padding': '5px',
-        'minWidth': '100px',
-        'whiteSpace': 'normal'
-    },
-    style_header={
-        'backgroundColor': '#4c00b0',
-        'color': 'white',
-        'fontWeight': 'bold'
-    },
-    style_data_conditional=[
-        {
-            'if': {'filter_query': f'{{Scientist}} = "{sci}"'},
-            'backgroundColor': color,
-            'color': 'white'
-        } for sci, color in scientist_colors.items()
-    ],
-    page_size=10
-)
     kpi_display = f"Total Pubs: {total_pubs} | Avg IF: {avg_if} | Most Cited: {most_cited_count}"
-    return kpi_display, bar_fig, scatter_fig, table
+    return kpi_display, bar_fig, scatter_fig
 
-@app.callback(
-    [Output('companies-kpi-output', 'children'),
-     Output('companies-gantt-output', 'children'),
-     Output('companies-table-output', 'children')],
-    [Input('companies-scientist-dropdown', 'value'),
-     Input('color-by-dropdown', 'value')]
+
+@background_callback(
+    [Output('avg-impact', 'children'),
+     Output('avg-impact-chart', 'figure'),
+     Output('scatter-impact-chart', 'figure')],
+    [Input('impact-scientist-dropdown', 'value'),
+     Input('if-threshold-slider', 'value')],
+    clientside_replaced=True,
+    **progress_outputs('impact-progress')
 )
-def update_companies_section(selected_sci, color_by):
-    companies_df = pd.read_excel(excel_file, sheet_name='Companies')
-    summary_df = pd.read_excel(excel_file, sheet_name='Companies Summary')
-    summary_df = summary_df.rename(columns={"Scientist Name": "Scientist"})
-
-    # Clean & convert data
-    companies_df = companies_df.dropna(subset=["Scientist", "Company", "Start Year", "End Year / Current"])
-    companies_df["End Year"] = companies_df["End Year / Current"].replace("Current", pd.Timestamp.now().year)
-    companies_df["Start Year"] = pd.to_numeric(companies_df["Start Year"], errors='coerce')
-    companies_df["End Year"] = pd.to_numeric(companies_df["End Year"], errors='coerce')
-    companies_df["Start Year"] = pd.to_datetime(companies_df["Start Year"], format="%Y", errors='coerce')
-    companies_df["End Year"] = pd.to_datetime(companies_df["End Year"], format="%Y", errors='coerce')
-    companies_df = companies_df.dropna(subset=["Start Year", "End Year"])
+@metrics.timed
+def update_impact_section(set_progress, selected_scientist, if_threshold):
+    set_progress(("0", "2"))
+    kpi_display, bar_fig, scatter_fig = build_impact_figures(selected_scientist, if_threshold)
+    set_progress(("1", "2"))
+    return kpi_display, patch_traces(bar_fig), patch_traces(scatter_fig)
+
+
+# --- Server-side DataTable pages ---
+def page_inputs(table_id):
+    return [Input(table_id, 'page_current'),
+            Input(table_id, 'page_size'),
+            Input(table_id, 'sort_by'),
+            Input(table_id, 'filter_query')]
+
+
+def table_outputs(table_id):
+    return [Output(table_id, 'data'),
+            Output(table_id, 'page_count'),
+            Output(table_id, 'page_current')]
+
+
+def filtered_page(df, filter_ids, page_current, page_size, sort_by, filter_query):
+    # A new scientist or threshold starts again from the first page.
+    if dash.ctx.triggered_id in filter_ids:
+        page_current = 0
+    data, page_count = table_page(df, page_current, page_size, sort_by, filter_query)
+    return data, page_count, min(page_current or 0, page_count - 1)
+
+
+@filter_callback(
+    table_outputs('impact-datatable'),
+    [Input('impact-scientist-dropdown', 'value'),
+     Input('if-threshold-slider', 'value')] + page_inputs('impact-datatable')
+)
+@metrics.timed
+def update_impact_table(selected_scientist, if_threshold, page_current, page_size, sort_by, filter_query):
+    df = impact_query(dataset.current, selected_scientist, if_threshold).rows.sort_index()
+    df = df[['Scientist', 'Title', 'Journal', 'Impact Factor', 'Total Citations', 'Impact Badge']]
+    return filtered_page(df, ('impact-scientist-dropdown', 'if-threshold-slider'),
+                         page_current, page_size, sort_by, filter_query)
+
+# The "All" career Gantt draws one bar per affiliation up to GANTT_DETAIL_ROWS
+# rows. Beyond that it shows one span per scientist (or, with more scientists
+# than that, affiliations active per year), and the bars are drawn only for a
+# selected scientist or a zoomed-in window small enough to fit.
+GANTT_DETAIL_ROWS = int(os.environ.get("DASHBOARD_GANTT_DETAIL_ROWS", "500"))
+
+
+def gantt_detail(df, y, color_by, title):
+    fig = px.timeline(
+        df,
+        x_start="Start Year",
+        x_end="End Year",
+        y=y,
+        color=color_by,
+        hover_data=["Scientist", "Company", "Role", "Focus Area"],
+        title=title
+    )
+    fig.update_yaxes(autorange="reversed")
+    return fig
+
+
+def gantt_overview(df, by_scientist, title):
+    if by_scientist:
+        spans = df.groupby("Scientist", observed=True).agg(**{
+            "Start Year": ("Start Year", "min"),
+            "End Year": ("End Year", "max"),
+            "Companies": ("Company", "nunique"),
+            "Affiliations": ("Company", "size")
+        }).reset_index()
+        fig = px.timeline(spans, x_start="Start Year", x_end="End Year", y="Scientist",
+                          hover_data=["Companies", "Affiliations"], title=title)
+        fig.update_yaxes(autorange="reversed")
+        return fig
+
+    # Affiliations active in each year, counted with a difference array.
+    start = df["Start Year"].dt.year.to_numpy()
+    end = df["End Year"].dt.year.to_numpy()
+    years = np.arange(start.min(), end.max() + 1)
+    delta = np.zeros(len(years) + 1, dtype=int)
+    np.add.at(delta, start - years[0], 1)
+    np.add.at(delta, end - years[0] + 1, -1)
+    fig = px.bar(x=pd.to_datetime(years.astype(str), format="%Y"), y=np.cumsum(delta)[:-1],
+                 labels={"x": "Year", "y": "Active affiliations"}, title=title)
+    return fig
+
+
+@render_cache.memoize
+def build_companies_gantt(selected_sci, color_by, y_range=None, x_range=None):
+    """Career Gantt, aggregated for "All" unless the zoom window (axis ranges
+    from the graph's relayoutData) holds at most GANTT_DETAIL_ROWS rows."""
+    ds = dataset.current
+    if selected_sci != "All":
+        fig = gantt_detail(ds.for_scientist('companies_df', selected_sci), "Company", color_by,
+                           f"Career Timeline for {selected_sci}")
+    else:
+        df = ds.companies_df
+        title = "Career Timeline for All Scientists"
+        scientists = sorted(df["Scientist"].unique())
+        by_scientist = len(scientists) <= GANTT_DETAIL_ROWS
+
+        window = df
+        if x_range:
+            window = window[(window["Start Year"] <= pd.Timestamp(x_range[1])) &
+                            (window["End Year"] >= pd.Timestamp(x_range[0]))]
+        if y_range and by_scientist:
+            # Category i is drawn at y = i.
+            low, high = sorted(y_range)
+            visible = scientists[max(math.ceil(low - 0.5), 0):math.floor(high + 0.5) + 1]
+            window = window[window["Scientist"].isin(visible)]
+
+        if len(window) <= GANTT_DETAIL_ROWS:
+            fig = gantt_detail(window, "Scientist", color_by, title)
+        else:
+            fig = gantt_overview(df, by_scientist, f"{title} (zoom in for details)")
+        if by_scientist:
+            # Same category positions in both views, so zoom ranges carry over.
+            fig.update_yaxes(categoryorder="array", categoryarray=scientists)
+            if y_range:
+                fig.update_yaxes(range=list(y_range), autorange=False)
+        if x_range:
+            fig.update_xaxes(range=list(x_range), autorange=False)
+
+    fig.update_layout(
+        height=500,
+        margin=dict(l=20, r=20, t=40, b=40),
+        xaxis_title="Year",
+        yaxis_title=None
+    )
+    return fig
+
+
+def zoom_window(relayout, window):
+    """Apply a Graph relayoutData event to the stored {"xaxis": range, "yaxis": range}
+    window; None if the event is not a zoom or reset."""
+    window = dict(window or {})
+    changed = False
+    for axis in ("xaxis", "yaxis"):
+        if relayout.get(f"{axis}.autorange"):
+            window.pop(axis, None)
+        elif f"{axis}.range[0]" in relayout:
+            window[axis] = [relayout[f"{axis}.range[0]"], relayout[f"{axis}.range[1]"]]
+        elif f"{axis}.range" in relayout:
+            window[axis] = list(relayout[f"{axis}.range"])
+        else:
+            continue
+        changed = True
+    return window if changed else None
+
+
+@render_cache.memoize
+def build_companies_section(selected_sci, color_by):
+    ds = dataset.current
+    companies_df = ds.companies_df
+    summary_df = ds.companies_summary_df
 
     # Filter
     if selected_sci == "All":
-        filtered_df = companies_df.copy()
-        filtered_summary = summary_df.copy()
+        filtered_df = companies_df
+        filtered_summary = summary_df
         kpi = html.Div()  # No KPI cards
     else:
-        filtered_df = companies_df[companies_df['Scientist'] == selected_sci]
-        filtered_summary = summary_df[summary_df['Scientist'] == selected_sci]
+        filtered_df = ds.for_scientist('companies_df', selected_sci)
+        filtered_summary = ds.for_scientist('companies_summary_df', selected_sci)
 
         if filtered_summary.empty:
             kpi = html.Div("No data available.")
@@ -687,30 +1125,17 @@ def update_companies_section(selected_sci, color_by):
                dbc.Col(dbc.Card(
                    dbc.CardBody([
                        html.H6(html.Span("FDA-Linked Patents", title="Patents connected to FDA-approved products"), className="card-title"),
-                       html.H4(html.Span(f"{row['FDA-Linked Patents']}", title=f"{row['FDA-Linked Patents']}"))
+                       html.H4(html.Span(f"{row['FDA-Approved Patents']}", title=f"{row['FDA-Approved Patents']}"))
                ]),
                style={'padding': '15px', 'textAlign': 'center', 'height': '120px'}
            ), width=3),
        ], className="mb-4")
 
-    # Gantt chart
-    gantt_fig = px.timeline(
-        filtered_df,
-        x_start="Start Year",
-        x_end="End Year",
-        y="Company" if selected_sci != "All" else "Scientist",
-        color=color_by,
-        hover_data=["Scientist", "Company", "Role", "Focus Area"],
-        title=f"Career Timeline for {'All Scientists' if selected_sci == 'All' else selected_sci}"
-    )
-    gantt_fig.update_yaxes(autorange="reversed")
-    gantt_fig.update_layout(
-        height=500,
-        margin=dict(l=20, r=20, t=40, b=40),
-        xaxis_title="Year",
-        yaxis_title=None
-    )
-    gantt = dcc.Graph(figure=gantt_fig)
+    # Gantt chart; the store keeps the zoom window for zoom_companies_gantt.
+    gantt = html.Div([
+        dcc.Graph(id='companies-gantt', figure=build_companies_gantt(selected_sci, color_by)),
+        dcc.Store(id='companies-gantt-window')
+    ])
 
     # Table
     if selected_sci == "All":
@@ -718,11 +1143,10 @@ def update_companies_section(selected_sci, color_by):
                                  "Clinical Trials Linked", "FDA-Approved Patents"]]
     else:
         table_data = filtered_df[["Company", "Role", "Focus Area", "Start Year", "End Year"]]
-
-    if "Start Year" in table_data.columns:
-        table_data["Start Year"] = pd.to_datetime(table_data["Start Year"]).dt.year
-    if "End Year" in table_data.columns:
-        table_data["End Year"] = pd.to_datetime(table_data["End Year"]).dt.year
+        table_data = table_data.assign(**{
+            "Start Year": table_data["Start Year"].dt.year,
+            "End Year": table_data["End Year"].dt.year
+        })
 
     table = dash_table.DataTable(
         columns=[{"name": col, "id": col} for col in table_data.columns],
@@ -739,45 +1163,181 @@ def update_companies_section(selected_sci, color_by):
 
     return kpi, gantt, table
 
+
+@background_callback(
+    [Output('companies-kpi-output', 'children'),
+     Output('companies-gantt-output', 'children'),
+     Output('companies-table-output', 'children')],
+    [Input('companies-scientist-dropdown', 'value'),
+     Input('color-by-dropdown', 'value')],
+    **progress_outputs('companies-progress')
+)
+@metrics.timed
+def update_companies_section(set_progress, selected_sci, color_by):
+    set_progress(("0", "2"))
+    kpi, gantt, table = build_companies_section(selected_sci, color_by)
+    set_progress(("1", "2"))
+    return kpi, gantt, table
+
+
 @app.callback(
-    Output('awards-scatter', 'figure'),
-    Input('awards-scientist-dropdown', 'value')
+    [Output('companies-gantt', 'figure'),
+     Output('companies-gantt-window', 'data')],
+    Input('companies-gantt', 'relayoutData'),
+    [State('companies-scientist-dropdown', 'value'),
+     State('color-by-dropdown', 'value'),
+     State('companies-gantt-window', 'data')],
+    prevent_initial_call=True
 )
-def update_awards_scatter(scientist):
+@metrics.timed
+def zoom_companies_gantt(relayout, selected_sci, color_by, window):
+    # Only the aggregated "All" view has more detail to load.
+    if selected_sci != "All" or not relayout or len(dataset.current.companies_df) <= GANTT_DETAIL_ROWS:
+        return dash.no_update, dash.no_update
+    window = zoom_window(relayout, window)
+    if window is None:
+        return dash.no_update, dash.no_update
+    y_range = tuple(window["yaxis"]) if "yaxis" in window else None
+    x_range = tuple(window["xaxis"]) if "xaxis" in window else None
+    return build_companies_gantt(selected_sci, color_by, y_range, x_range), window
+
+@render_cache.memoize
+def build_awards_scatter(ds, scientist):
     if scientist and scientist != 'all':
-        filtered_df = awards_df[awards_df['Scientist Name'] == scientist]
+        filtered_df = ds.for_scientist('awards_df', scientist)
     else:
-        filtered_df = awards_df
+        filtered_df = ds.awards_df
 
-    fig = px.scatter(
-        filtered_df,
-        x="Year",
-        y="Scientist Name",
-        color="Organization",
-        hover_data=["Awards", "Organization"],
-        title="Awards & Recognitions Timeline"
-    )
+    if len(filtered_df) > DENSITY_POINTS:
+        fig = awards_heatmap(filtered_df)
+        fig.update_layout(title="Awards & Recognitions Timeline")
+    else:
+        fig = px.scatter(
+            filtered_df,
+            x="Year",
+            y="Scientist Name",
+            color="Organization",
+            hover_data=["Awards", "Organization"],
+            title="Awards & Recognitions Timeline",
+            render_mode=render_mode(filtered_df)
+        )
     fig.update_layout(
         height=500,
         showlegend=False
     )
     return fig
-@app.callback(
-    Output('awards-table', 'data'),
-    Input('awards-scientist-dropdown', 'value')
+
+
+@filter_callback(
+    [Output('awards-scatter', 'figure')] + table_outputs('awards-table'),
+    [Input('awards-scientist-dropdown', 'value')] + page_inputs('awards-table')
 )
-def update_awards_table(scientist):
+@metrics.timed
+def update_awards_section(scientist, page_current, page_size, sort_by, filter_query):
+    ds = dataset.current
     if scientist and scientist != 'all':
-        return awards_df[awards_df['Scientist Name'] == scientist].to_dict('records')
-    return awards_df.to_dict('records')
+        df = ds.for_scientist('awards_df', scientist)
+    else:
+        df = ds.awards_df
+
+    # Paging, sorting or filtering the table leaves the scatter as it is.
+    if dash.ctx.triggered_id == 'awards-table':
+        scatter = dash.no_update
+    else:
+        fig = build_awards_scatter(ds, scientist)
+        scatter = patch_traces(fig)
+        # The dense view puts organizations, not scientists, on the y axis.
+        scatter['layout']['xaxis']['title'] = fig.layout.xaxis.title.to_plotly_json()
+        scatter['layout']['yaxis']['title'] = fig.layout.yaxis.title.to_plotly_json()
+
+    return (scatter, *filtered_page(df, ('awards-scientist-dropdown',), page_current, page_size, sort_by, filter_query))
+
+
+@app.callback(
+    [Output('notable-table', 'data'),
+     Output('notable-table', 'page_count')],
+    page_inputs('notable-table')
+)
+@metrics.timed
+def update_notable_table(page_current, page_size, sort_by, filter_query):
+    return table_page(dataset.current.notable_df, page_current, page_size, sort_by, filter_query)
+
+
+if CLIENTSIDE_FILTERING:
+    app.clientside_callback(
+        ClientsideFunction(namespace='dashboard', function_name='publications'),
+        [Output('total-pubs', 'children'),
+         Output('avg-pubs-year', 'children'),
+         Output('top10-pubs', 'children'),
+         Output('avg-rcr', 'children'),
+         Output('top10-chart', 'figure'),
+         Output('pubs-per-year-chart', 'figure'),
+         Output('total-pubs-chart', 'figure'),
+         Output('weighted-rcr-chart', 'figure'),
+         Output('mean-rcr-chart', 'figure'),
+         Output('avg-apt-chart', 'figure'),
+         Output('cited-clin-chart', 'figure')],
+        [Input('pubs-scientist-dropdown', 'value'),
+         Input('pubs-data', 'data')]
+    )
+    app.clientside_callback(
+        ClientsideFunction(namespace='dashboard', function_name='impact'),
+        [Output('avg-impact', 'children'),
+         Output('avg-impact-chart', 'figure'),
+         Output('scatter-impact-chart', 'figure'),
+         Output('impact-datatable', 'data')],
+        [Input('impact-scientist-dropdown', 'value'),
+         Input('if-threshold-slider', 'value'),
+         Input('impact-data', 'data')]
+    )
+    app.clientside_callback(
+        ClientsideFunction(namespace='dashboard', function_name='awards'),
+        [Output('awards-scatter', 'figure'),
+         Output('awards-table', 'data')],
+        [Input('awards-scientist-dropdown', 'value'),
+         Input('awards-data', 'data')]
+    )
 
 @app.callback(
     Output("main-wrapper", "className"),
     Input("theme-toggle", "value")
 )
+@metrics.timed
 def toggle_theme(dark_mode):
     return "dark-mode" if dark_mode else "light-mode"
 
+# --- Pre-rendered responses ---
+# Settings that change callback responses; `python -m prerender` output built
+# with other values (or for another workbook version) is not served.
+RESPONSE_SETTINGS = {
+    "clientside_filtering": CLIENTSIDE_FILTERING,
+    "background_callbacks": BACKGROUND_CALLBACKS,
+    "webgl_points": WEBGL_POINTS,
+    "density_points": DENSITY_POINTS,
+    "gantt_detail_rows": GANTT_DETAIL_ROWS,
+}
+prerender.install(app, lambda: dataset.current.version, RESPONSE_SETTINGS)
+
+# --- Warm-up ---
+warmed_up = threading.Event()
+
+
+def warm_up():
+    """Load the dataset and build every page's layout."""
+    try:
+        build_page_layouts()
+    except Exception:
+        server.logger.exception("Warm-up failed; the workbook watcher retries the load")
+    metrics.STARTUP_SECONDS.set(time.monotonic() - started)
+    warmed_up.set()
+
+
+def start_warm_up():
+    threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
+
+
+start_warm_up()
+
 # --- Run App ---
 if __name__ == '__main__':
     app.run(debug=False, host='0.0.0.0', port=10000)
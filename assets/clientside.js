@@ -0,0 +1,320 @@
+// Clientside filtering for the Publications, Impact and Awards pages.
+//
+// Enabled with DASHBOARD_CLIENTSIDE_FILTERING=1. The server ships each page's
+// compact dataset once in a dcc.Store ({columns, template}); dropdown and slider
+// changes are then filtered and drawn here without a server round-trip. Figures
+// mirror the plotly.express output built by the matching server callbacks in app.py.
+
+(function () {
+    function round(value, digits) {
+        var factor = Math.pow(10, digits);
+        return Math.round(value * factor) / factor;
+    }
+
+    function mean(values) {
+        var valid = values.filter(function (v) { return v !== null && !isNaN(v); });
+        if (!valid.length) {
+            return NaN;
+        }
+        return valid.reduce(function (a, b) { return a + b; }, 0) / valid.length;
+    }
+
+    // Column-oriented store -> array of row objects, keeping rows where keep(row).
+    function rows(store, keep) {
+        var names = Object.keys(store.columns);
+        var length = names.length ? store.columns[names[0]].length : 0;
+        var out = [];
+        for (var i = 0; i < length; i++) {
+            var row = {};
+            names.forEach(function (name) { row[name] = store.columns[name][i]; });
+            if (!keep || keep(row)) {
+                out.push(row);
+            }
+        }
+        return out;
+    }
+
+    function pluck(data, column) {
+        return data.map(function (row) { return row[column]; });
+    }
+
+    // One trace per value of `column`, in order of first appearance (as px does for color=).
+    function groupBy(data, column) {
+        var groups = [];
+        var byKey = {};
+        data.forEach(function (row) {
+            var key = row[column];
+            if (!(key in byKey)) {
+                byKey[key] = [];
+                groups.push([key, byKey[key]]);
+            }
+            byKey[key].push(row);
+        });
+        return groups;
+    }
+
+    function hoverTemplate(fields) {
+        return fields.map(function (field) { return field[0] + '=' + field[1]; }).join('<br>') + '<extra></extra>';
+    }
+
+    // 'scattergl' above the server's WebGL threshold, as px render_mode does.
+    function scatterType(store, count) {
+        return count > store.limits.webgl ? 'scattergl' : 'scatter';
+    }
+
+    function barFigure(store, data, x, y, title) {
+        return {
+            data: [{
+                type: 'bar',
+                x: pluck(data, x),
+                y: pluck(data, y),
+                orientation: 'v',
+                hovertemplate: hoverTemplate([[x, '%{x}'], [y, '%{y}']])
+            }],
+            layout: {
+                template: store.template,
+                title: {text: title},
+                xaxis: {title: {text: x}},
+                yaxis: {title: {text: y}},
+                barmode: 'relative'
+            }
+        };
+    }
+
+    function publications(scientist, store) {
+        if (!store) {
+            return window.dash_clientside.no_update;
+        }
+        var data = rows(store, function (row) {
+            return scientist === 'All' || row['Scientist Name'] === scientist;
+        });
+        var totalPubs = pluck(data, 'Total Pubs').reduce(function (a, b) { return a + (b || 0); }, 0);
+        var charts = [
+            ['Count of Pubs in top 10%', 'Publications in Top 10%'],
+            ['Pubs Per Year', 'Publications Per Year'],
+            ['Total Pubs', 'Total Publications'],
+            ['Weighted RCR', 'Weighted RCR'],
+            ['Mean RCR', 'Mean RCR'],
+            ['Avg APT', 'Average APT'],
+            ['Cited by Clin', 'Cited by Clinical Articles']
+        ].map(function (chart) {
+            return barFigure(store, data, 'Scientist Name', chart[0], chart[1]);
+        });
+        return [
+            totalPubs,
+            round(mean(pluck(data, 'Pubs Per Year')), 2),
+            round(mean(pluck(data, '% of pubs in Top 10%')), 1) + '%',
+            round(mean(pluck(data, 'Weighted RCR')), 2)
+        ].concat(charts);
+    }
+
+    function impact(scientist, threshold, store) {
+        if (!store) {
+            return window.dash_clientside.no_update;
+        }
+        var data = rows(store, function (row) {
+            if (scientist === 'All') {
+                if (row['Scientist'] === null || row['Impact Factor'] === null || row['Total Citations'] === null) {
+                    return false;
+                }
+            } else if (row['Scientist'] !== scientist) {
+                return false;
+            }
+            return row['Impact Factor'] >= threshold;
+        });
+        var mostCited = data.length ? Math.max.apply(null, pluck(data, 'Total Citations')) : 0;
+        var avgIf = data.length ? round(mean(pluck(data, 'Impact Factor')), 2) : '–';
+        var kpi = 'Total Pubs: ' + data.length + ' | Avg IF: ' + avgIf + ' | Most Cited: ' + mostCited;
+
+        var top10 = data.slice().sort(function (a, b) {
+            return b['Impact Factor'] - a['Impact Factor'];
+        }).slice(0, 10);
+        top10.forEach(function (row, i) {
+            row['Rank Label'] = ['🥇 1', '🥈 2', '🥉 3'][i] || String(i + 1);
+        });
+        var barFig = {
+            data: groupBy(top10, 'Scientist').map(function (group) {
+                return {
+                    type: 'bar',
+                    name: group[0],
+                    legendgroup: group[0],
+                    orientation: 'h',
+                    x: pluck(group[1], 'Impact Factor'),
+                    y: pluck(group[1], 'Rank Label'),
+                    customdata: group[1].map(function (row) {
+                        return [row['Title'], row['Journal'], row['Total Citations']];
+                    }),
+                    hovertemplate: hoverTemplate([
+                        ['Scientist', group[0]], ['Impact Factor', '%{x}'], ['Rank Label', '%{y}'],
+                        ['Title', '%{customdata[0]}'], ['Journal', '%{customdata[1]}'],
+                        ['Total Citations', '%{customdata[2]}']
+                    ])
+                };
+            }),
+            layout: {
+                template: store.template,
+                title: {text: 'Top 10 Publications by Impact Factor'},
+                legend: {title: {text: 'Scientist'}, tracegroupgap: 0},
+                barmode: 'relative',
+                height: 550,
+                width: 1000,
+                margin: {l: 150, r: 20, t: 60, b: 40},
+                xaxis: {title: {text: 'Impact Factor'}},
+                yaxis: {title: {text: 'Rank (1 = Highest Impact Factor)'}, tickfont: {size: 11}, automargin: true},
+                annotations: [{
+                    text: 'Ranked by Impact Factor (1 = highest)',
+                    xref: 'paper', yref: 'paper', x: 1, y: -0.2,
+                    showarrow: false, font: {size: 12}, align: 'right'
+                }]
+            }
+        };
+
+        var scatterTraces;
+        if (data.length > store.limits.density) {
+            // The rows are already in the browser, so let plotly.js bin them.
+            scatterTraces = [{
+                type: 'histogram2d',
+                x: pluck(data, 'Impact Factor'),
+                y: pluck(data, 'Total Citations'),
+                nbinsx: store.limits.bins,
+                nbinsy: store.limits.bins,
+                colorscale: 'Viridis',
+                colorbar: {title: {text: 'Publications'}},
+                hovertemplate: hoverTemplate([
+                    ['Impact Factor', '%{x}'], ['Total Citations', '%{y}'], ['Publications', '%{z}']
+                ])
+            }];
+        } else {
+            scatterTraces = groupBy(data, 'Scientist').map(function (group) {
+                return {
+                    type: scatterType(store, data.length),
+                    mode: 'markers',
+                    name: group[0],
+                    legendgroup: group[0],
+                    x: pluck(group[1], 'Impact Factor'),
+                    y: pluck(group[1], 'Total Citations'),
+                    customdata: group[1].map(function (row) { return [row['Title'], row['Journal']]; }),
+                    hovertemplate: hoverTemplate([
+                        ['Scientist', group[0]], ['Impact Factor', '%{x}'], ['Total Citations', '%{y}'],
+                        ['Title', '%{customdata[0]}'], ['Journal', '%{customdata[1]}']
+                    ])
+                };
+            });
+        }
+        var scatterFig = {
+            data: scatterTraces,
+            layout: {
+                template: store.template,
+                title: {text: 'Impact Factor vs. Total Citations'},
+                legend: {title: {text: 'Scientist'}, tracegroupgap: 0},
+                xaxis: {title: {text: 'Impact Factor'}},
+                yaxis: {title: {text: 'Total Citations'}}
+            }
+        };
+
+        var tableData = data.map(function (row) {
+            return {
+                'Scientist': row['Scientist'],
+                'Title': row['Title'],
+                'Journal': row['Journal'],
+                'Impact Factor': row['Impact Factor'],
+                'Total Citations': row['Total Citations'],
+                'Impact Badge': row['Impact Badge']
+            };
+        });
+        return [kpi, barFig, scatterFig, tableData];
+    }
+
+    function awards(scientist, store) {
+        if (!store) {
+            return window.dash_clientside.no_update;
+        }
+        var data = rows(store, function (row) {
+            return !scientist || scientist === 'all' || row['Scientist Name'] === scientist;
+        });
+        var dense = data.length > store.limits.density;
+        var scatterTraces;
+        if (dense) {
+            // Awards per year and organization on a fixed grid, as awards_heatmap does.
+            var dated = data.filter(function (row) { return row['Year'] !== null; });
+            var ranked = groupBy(dated.filter(function (row) { return row['Organization'] !== null; }), 'Organization');
+            // Array sort is stable, so ties keep their order of appearance (as value_counts).
+            ranked.sort(function (a, b) { return b[1].length - a[1].length; });
+            var organizations = ranked.slice(0, store.limits.bins).map(function (group) { return group[0]; });
+            var orgIndex = {};
+            organizations.forEach(function (org, i) { orgIndex[org] = i; });
+            if (dated.some(function (row) { return !(row['Organization'] in orgIndex); })) {
+                organizations.push('Other');
+            }
+            var years = pluck(dated, 'Year');
+            var low = Math.min.apply(null, years);
+            var high = Math.max.apply(null, years);
+            var yearBins = Math.min(high - low + 1, store.limits.bins);
+            var binWidth = (high - low + 1) / yearBins;
+            var z = organizations.map(function () {
+                var cells = [];
+                for (var i = 0; i < yearBins; i++) {
+                    cells.push(null);
+                }
+                return cells;
+            });
+            dated.forEach(function (row) {
+                var org = row['Organization'] in orgIndex ? orgIndex[row['Organization']] : organizations.length - 1;
+                var bin = Math.min(Math.floor((row['Year'] - low + 0.5) / binWidth), yearBins - 1);
+                z[org][bin] = (z[org][bin] || 0) + 1;
+            });
+            var centres = [];
+            for (var i = 0; i < yearBins; i++) {
+                centres.push(low - 0.5 + (i + 0.5) * binWidth);
+            }
+            scatterTraces = [{
+                type: 'heatmap',
+                x: centres,
+                y: organizations,
+                z: z,
+                colorscale: 'Viridis',
+                colorbar: {title: {text: 'Awards'}},
+                hovertemplate: hoverTemplate([
+                    ['Year', '%{x:.0f}'], ['Organization', '%{y}'], ['Awards', '%{z}']
+                ])
+            }];
+        } else {
+            scatterTraces = groupBy(data, 'Organization').map(function (group) {
+                return {
+                    type: scatterType(store, data.length),
+                    mode: 'markers',
+                    name: group[0],
+                    legendgroup: group[0],
+                    x: pluck(group[1], 'Year'),
+                    y: pluck(group[1], 'Scientist Name'),
+                    customdata: group[1].map(function (row) { return [row['Awards'], row['Organization']]; }),
+                    hovertemplate: hoverTemplate([
+                        ['Organization', group[0]], ['Year', '%{x}'], ['Scientist Name', '%{y}'],
+                        ['Awards', '%{customdata[0]}']
+                    ])
+                };
+            });
+        }
+        var scatterFig = {
+            data: scatterTraces,
+            layout: {
+                template: store.template,
+                title: {text: 'Awards & Recognitions Timeline'},
+                legend: {title: {text: 'Organization'}, tracegroupgap: 0},
+                xaxis: {title: {text: 'Year'}},
+                yaxis: {title: {text: dense ? 'Organization' : 'Scientist Name'}},
+                height: 500,
+                showlegend: false
+            }
+        };
+        return [scatterFig, data];
+    }
+
+    window.dash_clientside = Object.assign({}, window.dash_clientside, {
+        dashboard: {
+            publications: publications,
+            impact: impact,
+            awards: awards
+        }
+    });
+})();
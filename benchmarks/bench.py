@@ -0,0 +1,185 @@
+"""Callback latency benchmark against synthetic workbooks of growing size.
+
+    python -m benchmarks.bench                      # scales 1, 10, 100, 1000
+    python -m benchmarks.bench --scales 1 10 --repeat 50 --json bench.json
+
+For each scale a workbook is generated (see synthetic_workbook.py), then:
+
+* startup: ``import app`` in a fresh interpreter until its warm-up has loaded
+  the workbook and built the pages (when /readyz would answer 200), once with
+  an empty snapshot directory (Excel parse) and once with the snapshot written
+  by the first run;
+* callbacks: once the warm-up is done, every route and server callback is
+  posted through the Flask test client with the render cache disabled, so each
+  request does the full work. Routes are served from the page layouts the
+  warm-up built, as they are for visitors; building them counts as startup.
+
+Each measurement runs in its own subprocess so scales do not share state.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.synthetic_workbook import write_workbook
+
+DEFAULT_SCALES = (1, 10, 100, 1000)
+WORKDIR = os.path.join(tempfile.gettempdir(), "dashboard-bench")
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def cases(ds):
+    """(label, output, input values, changed prop) for each benchmarked request."""
+    pubs_sci = ds.publications_df["Scientist Name"].dropna().iloc[0]
+    impact_sci = ds.publications_impact_df["Scientist"].dropna().iloc[0]
+    companies_sci = ds.companies_scientists[0]
+    awards_sci = ds.awards_df["Scientist Name"].dropna().iloc[0]
+    out = [(f"display_page {path}", "page-content.children", {"url.pathname": path}, None)
+           for path in ("/", "/publications", "/impact", "/companies", "/awards")]
+    out += [
+        ("publications All", "total-pubs.children", {"pubs-scientist-dropdown.value": "All"}, None),
+        ("publications scientist", "total-pubs.children", {"pubs-scientist-dropdown.value": pubs_sci}, None),
+        ("publications open accordion", "pubs-per-year-chart.figure",
+         {"pubs-scientist-dropdown.value": "All", "pubs-accordion.active_item": "productivity"},
+         "pubs-accordion.active_item"),
+        ("impact All", "avg-impact.children",
+         {"impact-scientist-dropdown.value": "All", "if-threshold-slider.value": 10}, None),
+        ("impact All slider=60", "avg-impact.children",
+         {"impact-scientist-dropdown.value": "All", "if-threshold-slider.value": 60}, "if-threshold-slider.value"),
+        ("impact scientist", "avg-impact.children",
+         {"impact-scientist-dropdown.value": impact_sci, "if-threshold-slider.value": 10}, None),
+        ("impact table All", "impact-datatable.data",
+         {"impact-scientist-dropdown.value": "All", "if-threshold-slider.value": 10}, None),
+        ("impact table sorted", "impact-datatable.data",
+         {"impact-scientist-dropdown.value": "All", "if-threshold-slider.value": 10,
+          "impact-datatable.sort_by": [{"column_id": "Total Citations", "direction": "desc"}]},
+         "impact-datatable.sort_by"),
+        ("companies All", "companies-kpi-output.children",
+         {"companies-scientist-dropdown.value": "All", "color-by-dropdown.value": "Company"}, None),
+        ("companies scientist", "companies-kpi-output.children",
+         {"companies-scientist-dropdown.value": companies_sci, "color-by-dropdown.value": "Role"}, None),
+        ("awards all", "awards-scatter.figure", {"awards-scientist-dropdown.value": "all"}, None),
+        ("awards scientist", "awards-scatter.figure", {"awards-scientist-dropdown.value": awards_sci}, None),
+        ("awards table page", "awards-scatter.figure",
+         {"awards-scientist-dropdown.value": "all", "awards-table.page_current": 1}, "awards-table.page_current"),
+        ("notable table", "notable-table.data", {}, None),
+    ]
+    return out
+
+
+def percentile(samples, q):
+    ordered = sorted(samples)
+    return ordered[min(int(round(q / 100 * (len(ordered) - 1))), len(ordered) - 1)]
+
+
+def run_worker(repeat):
+    """Time every case in this process; the workbook comes from DASHBOARD_WORKBOOK."""
+    sys.path.insert(0, ROOT)
+    import app as dashboard
+    from benchmarks.dash_client import DashClient, FlaskTransport
+
+    # Otherwise the first cases run while the warm-up thread competes for the CPU.
+    dashboard.warmed_up.wait()
+
+    client = DashClient(FlaskTransport(dashboard.server))
+    results = []
+    for label, output, values, changed in cases(dashboard.dataset.current):
+        timings = []
+        size = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            status, body = client.call(output, values, changed)
+            timings.append((time.perf_counter() - start) * 1000)
+            if status != 200:
+                raise RuntimeError(f"{label}: HTTP {status}\n{body.decode(errors='replace')[-2000:]}")
+            size = len(body)
+        results.append({
+            "case": label,
+            "median_ms": statistics.median(timings),
+            "p95_ms": percentile(timings, 95),
+            "bytes": size,
+        })
+    json.dump(results, sys.stdout)
+
+
+def _env(workbook, snapshot_dir, **extra):
+    env = dict(os.environ, DASHBOARD_WORKBOOK=workbook, DASHBOARD_SNAPSHOT_DIR=snapshot_dir,
+               DASHBOARD_RELOAD_INTERVAL="0", **extra)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+    return env
+
+
+STARTUP_CODE = """
+import time
+start = time.perf_counter()
+import app
+app.warmed_up.wait()
+if not app.dataset.ready:
+    raise SystemExit("warm-up failed to load the workbook")
+print(time.perf_counter() - start)
+"""
+
+
+def time_startup(env):
+    """Milliseconds from ``import app`` until the app is ready to serve."""
+    out = subprocess.run([sys.executable, "-c", STARTUP_CODE], env=env, cwd=ROOT, check=True,
+                         capture_output=True, text=True)
+    return float(out.stdout.strip().splitlines()[-1]) * 1000
+
+
+def bench_scale(scale, repeat, render_cache):
+    os.makedirs(WORKDIR, exist_ok=True)
+    workbook = os.path.join(WORKDIR, f"workbook-x{scale}.xlsx")
+    if not os.path.exists(workbook):
+        write_workbook(scale, workbook)
+
+    with tempfile.TemporaryDirectory(dir=WORKDIR) as snapshot_dir:
+        env = _env(workbook, snapshot_dir,
+                   DASHBOARD_RENDER_CACHE_SIZE=os.environ.get("DASHBOARD_RENDER_CACHE_SIZE", "256")
+                   if render_cache else "0")
+        startup = {"cold_ms": time_startup(env), "warm_ms": time_startup(env)}
+        out = subprocess.run([sys.executable, "-m", "benchmarks.bench", "--worker", "--repeat", str(repeat)],
+                             env=env, cwd=ROOT, check=True, capture_output=True, text=True)
+    return {"scale": scale, "workbook_bytes": os.path.getsize(workbook), "startup": startup,
+            "callbacks": json.loads(out.stdout)}
+
+
+def report(results):
+    for result in results:
+        print(f"\nscale x{result['scale']}  ({result['workbook_bytes'] / 1024:.0f} KB workbook)")
+        print(f"  startup: cold {result['startup']['cold_ms']:.0f} ms, warm {result['startup']['warm_ms']:.0f} ms")
+        print(f"  {'case':<30} {'median ms':>10} {'p95 ms':>10} {'bytes':>10}")
+        for row in result["callbacks"]:
+            print(f"  {row['case']:<30} {row['median_ms']:>10.1f} {row['p95_ms']:>10.1f} {row['bytes']:>10}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scales", type=int, nargs="+", default=DEFAULT_SCALES)
+    parser.add_argument("--repeat", type=int, default=20, help="requests per case (default 20)")
+    parser.add_argument("--render-cache", action="store_true",
+                        help="leave the render cache on (measures repeat visits instead of full renders)")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        run_worker(args.repeat)
+        return
+
+    results = []
+    for scale in args.scales:
+        print(f"benchmarking x{scale}...", file=sys.stderr)
+        results.append(bench_scale(scale, args.repeat, args.render_cache))
+    report(results)
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
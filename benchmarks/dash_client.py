@@ -0,0 +1,156 @@
+"""Minimal client for Dash's callback endpoint, shared by the benchmarks.
+
+Builds ``/_dash-update-component`` requests the way the Dash renderer does,
+from the app's ``/_dash-dependencies`` listing.
+"""
+import gzip
+import http.client
+import json
+import time
+import urllib.parse
+
+# Values for inputs a benchmark case does not set explicitly.
+DEFAULT_INPUTS = {
+    "page_current": 0,
+    "page_size": 10,
+    "sort_by": [],
+    "filter_query": "",
+}
+
+
+def _split(prop_id):
+    component_id, prop = prop_id.rsplit(".", 1)
+    return {"id": component_id, "property": prop}
+
+
+class DashClient:
+    """``transport`` has ``get_json(path)`` and ``post_json(path, payload) -> (status, body bytes)``."""
+
+    def __init__(self, transport, dependencies=None):
+        self.transport = transport
+        if dependencies is None:
+            dependencies = [dep for dep in transport.get_json("/_dash-dependencies")
+                            if not dep.get("clientside_function")]
+        self.dependencies = dependencies
+
+    def dependency(self, output):
+        """The server callback whose outputs include ``output`` (e.g. "avg-impact.children")."""
+        for dep in self.dependencies:
+            if output in dep["output"].strip(".").split("..."):
+                return dep
+        raise KeyError(output)
+
+    def payload(self, output, values, changed=None):
+        """Request body for the callback owning ``output``.
+
+        ``values`` maps "id.prop" to the input value; unset inputs fall back to
+        DEFAULT_INPUTS or None. ``changed`` is the triggering "id.prop" and
+        defaults to the first input.
+        """
+        dep = self.dependency(output)
+        inputs = []
+        for inp in dep["inputs"]:
+            prop_id = f"{inp['id']}.{inp['property']}"
+            inputs.append({"id": inp["id"], "property": inp["property"],
+                           "value": values.get(prop_id, DEFAULT_INPUTS.get(inp["property"]))})
+        outputs = [_split(prop_id) for prop_id in dep["output"].strip(".").split("...")]
+        return {
+            "output": dep["output"],
+            "outputs": outputs if len(outputs) > 1 else outputs[0],
+            "inputs": inputs,
+            "changedPropIds": [changed or f"{inputs[0]['id']}.{inputs[0]['property']}"],
+            "state": [{"id": s["id"], "property": s["property"], "value": None} for s in dep["state"]],
+        }
+
+    def call(self, output, values, changed=None, poll_interval=0.05, timeout=120):
+        """POST the callback; background callbacks are polled until they finish."""
+        payload = self.payload(output, values, changed)
+        status, body = self.transport.post_json("/_dash-update-component", payload)
+        if status != 200 or not body.startswith(b'{"cacheKey"'):
+            return status, body
+
+        # A background job: the renderer re-posts with the job's handles until
+        # the result (rather than just progress) comes back.
+        handles = json.loads(body)
+        path = "/_dash-update-component?" + urllib.parse.urlencode(
+            {"cacheKey": handles["cacheKey"], "job": handles["job"]}
+        )
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            time.sleep(poll_interval)
+            status, body = self.transport.post_json(path, payload)
+            if status != 200 or b'"response"' in body:
+                return status, body
+        raise TimeoutError(f"background callback for {output} did not finish in {timeout} s")
+
+
+def find_component(layout, component_id):
+    """The props of the component with ``component_id`` in a serialized layout, or None."""
+    if isinstance(layout, list):
+        for child in layout:
+            found = find_component(child, component_id)
+            if found is not None:
+                return found
+    elif isinstance(layout, dict):
+        props = layout.get("props")
+        if isinstance(props, dict):
+            if props.get("id") == component_id:
+                return props
+            return find_component(props.get("children"), component_id)
+        for value in layout.values():
+            found = find_component(value, component_id)
+            if found is not None:
+                return found
+    return None
+
+
+class FlaskTransport:
+    def __init__(self, flask_app):
+        self.client = flask_app.test_client()
+
+    def get_json(self, path):
+        return self.client.get(path).get_json()
+
+    def post_json(self, path, payload):
+        response = self.client.post(path, json=payload)
+        return response.status_code, response.data
+
+
+class HttpTransport:
+    """Keep-alive HTTP connection to a running server; one per thread."""
+
+    def __init__(self, base_url, timeout=120):
+        parts = urllib.parse.urlsplit(base_url)
+        self.host = parts.hostname
+        self.port = parts.port or 80
+        self.prefix = parts.path.rstrip("/")
+        self.timeout = timeout
+        self._conn = None
+
+    def _request(self, method, path, body=None):
+        headers = {"Accept-Encoding": "gzip"}
+        if body is not None:
+            headers["Content-Type"] = "application/json"
+        for attempt in (0, 1):
+            if self._conn is None:
+                self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+            try:
+                self._conn.request(method, self.prefix + path, body=body, headers=headers)
+                response = self._conn.getresponse()
+                data = response.read()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                # The server closed an idle keep-alive connection; reconnect once.
+                self._conn.close()
+                self._conn = None
+                if attempt:
+                    raise
+        if response.getheader("Content-Encoding") == "gzip":
+            data = gzip.decompress(data)
+        return response.status, data
+
+    def get_json(self, path):
+        return json.loads(self._request("GET", path)[1])
+
+    def post_json(self, path, payload):
+        return self._request("POST", path, json.dumps(payload).encode())
@@ -0,0 +1,224 @@
+"""Replay concurrent user sessions against ``/_dash-update-component``.
+
+    python -m benchmarks.loadtest --concurrency 8 --sessions 200
+    python -m benchmarks.loadtest --workers 4 --concurrency 32      # starts gunicorn
+    python -m benchmarks.loadtest --url http://127.0.0.1:10000      # an existing server
+
+Each session does what a visitor does on the Impact and Companies pages: open
+/impact, drag the Impact Factor slider, switch scientist, open /companies and
+change "Color by". Every step posts the callbacks the browser would fire, and
+throughput plus p50/p95/p99 latency are reported per callback.
+
+Without --url or --workers the app is imported and driven through the Flask
+test client in this process, which measures callback cost but not worker
+concurrency (all threads share one GIL). Callbacks moved to the browser by
+DASHBOARD_CLIENTSIDE_FILTERING are not sent.
+"""
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.bench import ROOT, percentile
+from benchmarks.dash_client import DashClient, FlaskTransport, HttpTransport, find_component
+
+
+def _options(client, pathname, dropdown_id, exclude):
+    status, body = client.call("page-content.children", {"url.pathname": pathname})
+    props = find_component(json.loads(body), dropdown_id) or {}
+    return [opt["value"] for opt in props.get("options", []) if opt["value"] != exclude]
+
+
+def session_steps(rng, impact_scientists, companies_scientists):
+    """[(callback name, output, values, changed)] for one visitor."""
+    impact = {"impact-scientist-dropdown.value": "All", "if-threshold-slider.value": 10}
+    steps = [("display_page", "page-content.children", {"url.pathname": "/impact"}, None)]
+
+    def impact_callbacks(changed):
+        return [("update_impact_section", "avg-impact.children", dict(impact), changed),
+                ("update_impact_table", "impact-datatable.data", dict(impact), changed)]
+
+    steps += impact_callbacks(None)
+    for _ in range(rng.randint(1, 3)):
+        impact["if-threshold-slider.value"] = rng.randint(0, 100)
+        steps += impact_callbacks("if-threshold-slider.value")
+    if impact_scientists:
+        impact["impact-scientist-dropdown.value"] = rng.choice(impact_scientists)
+        steps += impact_callbacks("impact-scientist-dropdown.value")
+
+    companies = {"companies-scientist-dropdown.value": "All", "color-by-dropdown.value": "Company"}
+    steps.append(("display_page", "page-content.children", {"url.pathname": "/companies"}, None))
+    steps.append(("update_companies_section", "companies-kpi-output.children", dict(companies), None))
+    companies["color-by-dropdown.value"] = "Role"
+    steps.append(("update_companies_section", "companies-kpi-output.children", dict(companies),
+                  "color-by-dropdown.value"))
+    if companies_scientists:
+        companies["companies-scientist-dropdown.value"] = rng.choice(companies_scientists)
+        steps.append(("update_companies_section", "companies-kpi-output.children", dict(companies),
+                      "companies-scientist-dropdown.value"))
+    return steps
+
+
+class LoadTest:
+    def __init__(self, make_transport, sessions, concurrency, seed=0):
+        self.make_transport = make_transport
+        self.sessions = sessions
+        self.concurrency = concurrency
+        self.seed = seed
+        self.timings = defaultdict(list)
+        self.errors = defaultdict(int)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        client = DashClient(make_transport())
+        self.dependencies = client.dependencies
+        self.impact_scientists = _options(client, "/impact", "impact-scientist-dropdown", "All")
+        self.companies_scientists = _options(client, "/companies", "companies-scientist-dropdown", "All")
+        self.skipped = {"update_impact_section", "update_impact_table", "update_companies_section"}
+        for name, output in (("update_impact_section", "avg-impact.children"),
+                             ("update_impact_table", "impact-datatable.data"),
+                             ("update_companies_section", "companies-kpi-output.children")):
+            try:
+                client.dependency(output)
+                self.skipped.discard(name)
+            except KeyError:
+                pass
+
+    def _client(self):
+        client = getattr(self._local, "client", None)
+        if client is None:
+            client = self._local.client = DashClient(self.make_transport(), self.dependencies)
+        return client
+
+    def run_session(self, number):
+        client = self._client()
+        rng = random.Random(self.seed * 1_000_003 + number)
+        for name, output, values, changed in session_steps(rng, self.impact_scientists, self.companies_scientists):
+            if name in self.skipped:
+                continue
+            start = time.perf_counter()
+            try:
+                status, _ = client.call(output, values, changed)
+            except OSError:
+                status = None
+            elapsed = (time.perf_counter() - start) * 1000
+            with self._lock:
+                if status in (200, 204):
+                    self.timings[name].append(elapsed)
+                else:
+                    self.errors[name] += 1
+
+    def run(self):
+        start = time.perf_counter()
+        with ThreadPoolExecutor(self.concurrency) as pool:
+            list(pool.map(self.run_session, range(self.sessions)))
+        return time.perf_counter() - start
+
+    def summary(self, wall_time):
+        callbacks = {}
+        for name in sorted(set(self.timings) | set(self.errors)):
+            samples = self.timings.get(name, [])
+            callbacks[name] = {
+                "requests": len(samples),
+                "errors": self.errors.get(name, 0),
+                "per_second": len(samples) / wall_time,
+                "p50_ms": percentile(samples, 50) if samples else None,
+                "p95_ms": percentile(samples, 95) if samples else None,
+                "p99_ms": percentile(samples, 99) if samples else None,
+            }
+        requests = sum(len(samples) for samples in self.timings.values())
+        return {
+            "sessions": self.sessions,
+            "concurrency": self.concurrency,
+            "wall_time_s": wall_time,
+            "requests": requests,
+            "requests_per_second": requests / wall_time,
+            "sessions_per_second": self.sessions / wall_time,
+            "skipped": sorted(self.skipped),
+            "callbacks": callbacks,
+        }
+
+
+def report(summary):
+    print(f"{summary['sessions']} sessions at concurrency {summary['concurrency']} in {summary['wall_time_s']:.1f} s: "
+          f"{summary['requests_per_second']:.1f} req/s, {summary['sessions_per_second']:.2f} sessions/s")
+    if summary["skipped"]:
+        print(f"not sent (clientside): {', '.join(summary['skipped'])}")
+    print(f"{'callback':<26} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name, row in summary["callbacks"].items():
+        latencies = "".join(f"{row[key]:>10.1f}" if row[key] is not None else f"{'-':>10}"
+                            for key in ("p50_ms", "p95_ms", "p99_ms"))
+        print(f"{name:<26} {row['requests']:>9} {row['errors']:>7} {row['per_second']:>8.1f}{latencies}")
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers, timeout=180):
+    """Start gunicorn with ``workers`` workers on a free port; returns (process, url)."""
+    port = _free_port()
+    env = dict(os.environ, PORT=str(port), WEB_CONCURRENCY=str(workers))
+    process = subprocess.Popen([sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"], cwd=ROOT, env=env)
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn exited with status {process.returncode}")
+        try:
+            urllib.request.urlopen(url + "/_dash-dependencies", timeout=5).read()
+            return process, url
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.5)
+    process.terminate()
+    raise RuntimeError(f"gunicorn did not answer on {url} within {timeout} s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="base URL of a running dashboard")
+    target.add_argument("--workers", type=int, help="start gunicorn with this many workers and test it")
+    parser.add_argument("--concurrency", type=int, default=8, help="simultaneous sessions (default 8)")
+    parser.add_argument("--sessions", type=int, default=100, help="sessions to replay (default 100)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the summary to this file")
+    args = parser.parse_args(argv)
+
+    process = None
+    if args.workers:
+        process, args.url = start_server(args.workers)
+    try:
+        if args.url:
+            url = args.url
+            make_transport = lambda: HttpTransport(url)
+        else:
+            sys.path.insert(0, ROOT)
+            import app as dashboard
+            make_transport = lambda: FlaskTransport(dashboard.server)
+        load_test = LoadTest(make_transport, args.sessions, args.concurrency, args.seed)
+        summary = load_test.summary(load_test.run())
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    report(summary)
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(summary, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Write a synthetic copy of the dashboard workbook at N times the scientist count.
+
+Every sheet the app reads keeps its name and columns. Each real scientist's rows
+are repeated ``scale`` times under a new name (``"<name> #<k>"``), with Impact
+Factor, citations and award years jittered so sorting and thresholds behave
+like real data.
+
+    python -m benchmarks.synthetic_workbook 100 /tmp/workbook_x100.xlsx
+"""
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+from datastore import SHEETS
+
+SOURCE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                      "assets", "damon_runyon_data_CLEAN.xlsx")
+
+
+def _scale_sheet(sheet, df, scale, rng):
+    # The scientist's name is the first column of every sheet.
+    name_column = df.columns[0]
+    copies = []
+    for k in range(scale):
+        copy = df.copy()
+        if k:
+            copy[name_column] = copy[name_column].map(lambda name: f"{name} #{k}", na_action="ignore")
+            if sheet == "Publications Impact":
+                copy["Impact Factor"] = (copy["Impact Factor"] * rng.uniform(0.2, 1.3, len(copy))).round(1)
+                copy["Total Citations"] = (copy["Total Citations"] * rng.uniform(0.1, 1.5, len(copy))).round().astype("Int64")
+            elif sheet == "Awards & Recognitions":
+                copy["Year"] = copy["Year"] + rng.integers(-3, 4, len(copy))
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+
+def write_workbook(scale, path, source=SOURCE, seed=0):
+    rng = np.random.default_rng(seed)
+    sheets = pd.read_excel(source, sheet_name=list(SHEETS))
+    with pd.ExcelWriter(path) as writer:
+        for sheet in SHEETS:
+            _scale_sheet(sheet, sheets[sheet], scale, rng).to_excel(writer, sheet_name=sheet, index=False)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("scale", type=int, help="multiple of the current scientist count")
+    parser.add_argument("path", help="where to write the .xlsx file")
+    args = parser.parse_args()
+    write_workbook(args.scale, args.path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,500 @@
+"""Workbook loading for the dashboard.
+
+Parsing the Excel workbook with openpyxl dominates cold start, so the sheets the
+dashboard reads are parsed once and written to an Arrow snapshot keyed by the
+workbook's content hash. Later starts memory-map the snapshot instead.
+
+DatasetManager watches the workbook and publishes each new version as an
+immutable Dataset, swapped in with a single reference assignment.
+"""
+import hashlib
+import logging
+import os
+import re
+import shutil
+import threading
+import time
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_DIR = os.environ.get("DASHBOARD_SNAPSHOT_DIR", ".snapshot")
+
+# Bump when the on-disk layout, the normalisation in _arrow_safe or the
+# schema in apply_schema changes.
+SNAPSHOT_FORMAT = "2"
+
+SHEETS = (
+    "NIH & Grant Funding Impact",
+    "Awards & Recognitions",
+    "Publications (ICite #)",
+    "Publications Impact",
+    "Companies",
+    "Companies Summary",
+)
+
+
+def workbook_hash(path):
+    digest = hashlib.sha256(SNAPSHOT_FORMAT.encode())
+    with open(path, "rb") as fh:
+        for chunk in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _sheet_file(directory, sheet):
+    return os.path.join(directory, re.sub(r"[^A-Za-z0-9]+", "_", sheet).strip("_") + ".arrow")
+
+
+def _arrow_safe(df):
+    # Excel columns such as "End Year / Current" mix ints and strings, which Arrow
+    # cannot store in one column. Keep the values as strings (NaN stays NaN).
+    for col in df.columns:
+        if df[col].dtype == object and df[col].dropna().map(type).nunique() > 1:
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str)).astype("str")
+    return df
+
+
+def _write_snapshot(sheets, directory):
+    tmp_dir = f"{directory}.tmp-{os.getpid()}"
+    os.makedirs(tmp_dir, exist_ok=True)
+    try:
+        for sheet, df in sheets.items():
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            with pa.OSFile(_sheet_file(tmp_dir, sheet), "wb") as sink:
+                with pa.ipc.new_file(sink, table.schema) as writer:
+                    writer.write_table(table)
+        os.replace(tmp_dir, directory)
+        _prune_snapshots(directory)
+    except OSError:
+        # Another worker published the same snapshot first, or the directory is
+        # read-only; either way the frames already parsed are still valid.
+        pass
+    finally:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+def _prune_snapshots(directory):
+    # Snapshots of earlier workbook versions or formats are never read again.
+    # Workers still memory-mapping one keep their pages after it is unlinked.
+    # Only snapshot directories (named by their digest) are removed, since
+    # DASHBOARD_SNAPSHOT_DIR may be shared with other data.
+    parent, current = os.path.split(directory)
+    for entry in os.listdir(parent):
+        if entry != current and re.fullmatch(r"[0-9a-f]{64}", entry):
+            shutil.rmtree(os.path.join(parent, entry), ignore_errors=True)
+
+
+def _read_snapshot(directory):
+    sheets = {}
+    for sheet in SHEETS:
+        with pa.memory_map(_sheet_file(directory, sheet), "r") as source:
+            sheets[sheet] = pa.ipc.open_file(source).read_all().to_pandas()
+    return sheets
+
+
+def load_workbook(path, digest=None):
+    """Return {sheet name: DataFrame} for SHEETS, typed by apply_schema, via the
+    snapshot cache."""
+    directory = os.path.join(SNAPSHOT_DIR, digest or workbook_hash(path))
+    if os.path.isdir(directory):
+        try:
+            with metrics.section("read_snapshot", metrics.WORKBOOK_LOAD_SECONDS, source="snapshot"):
+                sheets = _read_snapshot(directory)
+            metrics.WORKBOOK_LOADS.labels(source="snapshot").inc()
+            return sheets
+        except (OSError, pa.ArrowInvalid):
+            shutil.rmtree(directory, ignore_errors=True)
+
+    with metrics.section("read_excel", metrics.WORKBOOK_LOAD_SECONDS, source="excel"):
+        sheets = pd.read_excel(path, sheet_name=list(SHEETS))
+    metrics.WORKBOOK_LOADS.labels(source="excel").inc()
+    sheets = apply_schema({sheet: _arrow_safe(df) for sheet, df in sheets.items()})
+    _write_snapshot(sheets, directory)
+    return sheets
+
+# Column holding the scientist's name in each Dataset frame.
+SCIENTIST_COLUMNS = {
+    "awards_df": "Scientist Name",
+    "publications_df": "Scientist Name",
+    "publications_impact_df": "Scientist",
+    "companies_df": "Scientist",
+    "companies_summary_df": "Scientist",
+}
+
+
+def scientist_key(name):
+    return " ".join(str(name).split()).casefold()
+
+
+def _scientist_keys(names):
+    """``scientist_key`` of every name in a Series."""
+    return names.str.split().str.join(" ").str.casefold()
+
+
+def _impact_badges(df):
+    high_if = np.where(df["Impact Factor"] > 25, "🔥 High IF", "")
+    highly_cited = np.where(df["Total Citations"] > 500, "📈 Highly Cited", "")
+    separator = np.where((high_if != "") & (highly_cited != ""), " | ", "")
+    return pd.Series(np.char.add(np.char.add(high_if, separator), highly_cited), index=df.index, dtype=object)
+
+
+def _partition(df, column):
+    keys = _scientist_keys(df[column])
+    return {key: rows for key, rows in df.groupby(keys, sort=False)}
+
+
+# Typed schema applied to the sheets when a Dataset is built. Labels repeated
+# across rows are stored as categoricals: one small integer code per row
+# instead of a Python string, and equality filters compare the codes.
+CATEGORY_COLUMNS = {
+    "NIH & Grant Funding Impact": ("Scientist Name",),
+    "Awards & Recognitions": ("Scientist Name", "Organization"),
+    "Publications (ICite #)": ("Scientist Name",),
+    "Publications Impact": ("Scientist", "Journal"),
+    "Companies": ("Scientist", "Company", "Role", "Focus Area", "Company Status"),
+    "Companies Summary": ("Scientist", "Scientist Name"),
+}
+
+# Percentages parsed once to numbers in 0-100 (see percent_values).
+PERCENT_COLUMNS = {
+    "Publications (ICite #)": ("% of pubs in Top 10%",),
+}
+
+
+def percent_values(series):
+    """Percentages as numbers: "83%" -> 83.0, and Excel percent cells, which
+    are read as fractions (0.83), -> 83.0."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series * 100
+    return pd.to_numeric(series.astype(str).str.rstrip("%"), errors="coerce")
+
+
+def apply_schema(sheets):
+    """Return ``sheets`` with the dtypes above: categoricals, parsed percentages
+    and downcast integers."""
+    typed = {}
+    for sheet, df in sheets.items():
+        # Integer columns (years, counts) take the smallest type that holds them;
+        # floats stay float64 so values reach the charts unrounded.
+        columns = {col: pd.to_numeric(df[col], downcast="integer")
+                   for col in df.columns if pd.api.types.is_integer_dtype(df[col])}
+        for col in PERCENT_COLUMNS.get(sheet, ()):
+            if col in df:
+                columns[col] = percent_values(df[col])
+        for col in CATEGORY_COLUMNS.get(sheet, ()):
+            if col in df:
+                columns[col] = df[col].astype("category")
+        typed[sheet] = df.assign(**columns)
+    return typed
+
+
+# Key of the aggregates row covering every scientist; the dropdowns' "All"
+# and "all" both normalise to it.
+ALL = scientist_key("All")
+
+# Aggregates that are counts: 0 rather than NaN for a scientist with no rows.
+COUNT_KPIS = ("Total Pubs", "Awards", "Companies Founded", "FDA-Approved Patents")
+
+NIH_GRANTS = "Count of New NIH Grants (Post-Damon Runyon Award) (ie total projects)"
+
+
+def label_counts(series):
+    """``series.value_counts()``, also for categoricals: only the labels present,
+    with ties in order of appearance (as for strings) rather than category order."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        series = series.astype(series.cat.categories.dtype)
+    return series.value_counts()
+
+
+def _most_common(series):
+    counts = label_counts(series)
+    return counts.idxmax() if len(counts) else None
+
+
+def _by_scientist(df, column, **aggs):
+    """``df.groupby(scientist).agg(**aggs)`` plus an ALL row over every row."""
+    df = df[df[column].notna()]
+    keys = _scientist_keys(df[column])
+    return pd.concat([
+        df.groupby(np.full(len(df), ALL)).agg(**aggs),
+        df.groupby(keys).agg(**aggs)
+    ])
+
+
+def _aggregates(ds):
+    """KPI table for the dashboard: one row per scientist key plus ALL."""
+    publications = _by_scientist(
+        ds.publications_df,
+        "Scientist Name",
+        **{
+            "Total Pubs": ("Total Pubs", "sum"),
+            "Pubs Per Year": ("Pubs Per Year", "mean"),
+            "% of pubs in Top 10%": ("% of pubs in Top 10%", "mean"),
+            "Weighted RCR": ("Weighted RCR", "mean"),
+        }
+    )
+    awards = _by_scientist(ds.awards_df, "Scientist Name", **{
+        "Awards": ("Awards", "size"),
+        "Most Awarded Scientist": ("Scientist Name", _most_common),
+        "Most Common Organization": ("Organization", _most_common),
+    })
+    nih_grants = pd.to_numeric(ds.funding_df[NIH_GRANTS], errors="coerce")
+    funding = _by_scientist(
+        ds.funding_df.assign(**{
+            "Received NIH Grants %": (nih_grants > 0) * 100.0,
+            "Multiple NIH Grants %": (nih_grants > 1) * 100.0,
+        }),
+        "Scientist Name",
+        **{
+            "Received NIH Grants %": ("Received NIH Grants %", "mean"),
+            "Multiple NIH Grants %": ("Multiple NIH Grants %", "mean"),
+        }
+    )
+    summary = ds.companies_summary_df
+    companies = _by_scientist(
+        summary.assign(**{
+            "Companies Founded": pd.to_numeric(summary["Companies Founded"], errors="coerce"),
+            "Academic Positions %": summary["Current Academic Position"].notna() * 100.0,
+        }),
+        "Scientist",
+        **{
+            "Companies Founded": ("Companies Founded", "sum"),
+            "FDA-Approved Patents": ("FDA-Approved Patents", "count"),
+            "Academic Positions %": ("Academic Positions %", "mean"),
+        }
+    )
+    aggregates = pd.concat([publications, awards, funding, companies], axis=1)
+    counts = list(COUNT_KPIS)
+    aggregates[counts] = aggregates[counts].fillna(0).astype(int)
+    return aggregates
+
+
+ImpactSlice = namedtuple("ImpactSlice", "rows count mean_impact_factor max_citations")
+
+
+class ImpactIndex:
+    """Publications presorted by Impact Factor with prefix aggregates.
+
+    Rows passing ``Impact Factor >= threshold`` are a prefix of the descending
+    order, so the slider's slice and KPIs come from one binary search.
+    """
+
+    def __init__(self, df):
+        df = df[df["Impact Factor"].notna()]
+        self.rows = df.sort_values("Impact Factor", ascending=False, kind="stable")
+        impact_factor = self.rows["Impact Factor"].to_numpy(dtype=float)
+        self._neg_impact_factor = -impact_factor
+        self._impact_factor_sum = np.cumsum(impact_factor)
+        self._max_citations = np.fmax.accumulate(self.rows["Total Citations"].to_numpy(dtype=float))
+
+    def query(self, threshold):
+        count = int(np.searchsorted(self._neg_impact_factor, -threshold, side="right"))
+        if not count:
+            return ImpactSlice(self.rows.iloc[0:0], 0, float("nan"), float("nan"))
+        return ImpactSlice(
+            self.rows.iloc[:count],
+            count,
+            self._impact_factor_sum[count - 1] / count,
+            self._max_citations[count - 1]
+        )
+
+
+class Dataset:
+    """One loaded version of the workbook. Never mutated after construction."""
+
+    def __init__(self, version, sheets):
+        self.version = version
+        self.funding_df = sheets["NIH & Grant Funding Impact"]
+        self.awards_df = sheets["Awards & Recognitions"]
+        self.publications_df = sheets["Publications (ICite #)"]
+        self.publications_impact_df = sheets["Publications Impact"].assign(**{
+            "Impact Badge": lambda df: _impact_badges(df)
+        })
+
+        self.scientists = self.funding_df[self.funding_df.columns[0]].dropna().unique()
+
+        self.notable_df = sheets["Companies Summary"][
+            ["Scientist", "Current Academic Position", "Notable Awards", "High-Impact Publications (#)",
+             "Total Funding Raised by Companies", "IPOs / Acquisitions"]
+        ].dropna(how="all")
+
+        timeline_data = self.funding_df[[
+            "Scientist Name", "Award Start Date", "Time to First NIH Grant (Post-Damon Runyon Award)"
+        ]].copy()
+        timeline_data["Award Start Date"] = pd.to_datetime(timeline_data["Award Start Date"], errors="coerce")
+        timeline_data["NIH Months"] = timeline_data["Time to First NIH Grant (Post-Damon Runyon Award)"].str.extract(r"(\d+)").astype(float)
+        self.timeline_data = timeline_data
+
+        self.companies_scientists = sorted(sheets["Companies"]["Scientist"].dropna().unique())
+        self.companies_df = self._prepare_companies(sheets["Companies"])
+        self.companies_summary_df = sheets["Companies Summary"].rename(columns={"Scientist Name": "Scientist"})
+
+        self._index = {
+            frame: _partition(getattr(self, frame), column) for frame, column in SCIENTIST_COLUMNS.items()
+        }
+
+        self._impact_index = {
+            key: ImpactIndex(rows) for key, rows in self._index["publications_impact_df"].items()
+        }
+        self._impact_index[None] = ImpactIndex(
+            self.publications_impact_df.dropna(subset=["Scientist", "Impact Factor", "Total Citations"])
+        )
+
+        self.aggregates = _aggregates(self)
+
+    def for_scientist(self, frame, scientist):
+        """Pre-sliced rows of ``frame`` (e.g. "awards_df") for ``scientist``.
+
+        The returned frame is shared between requests and must not be mutated.
+        """
+        rows = self._index[frame].get(scientist_key(scientist))
+        if rows is None:
+            return getattr(self, frame).iloc[0:0]
+        return rows
+
+    def kpis(self, scientist="All"):
+        """Row of ``aggregates`` for ``scientist``, or for everyone given "All"."""
+        key = scientist_key(scientist)
+        if key in self.aggregates.index:
+            return self.aggregates.loc[key]
+        return pd.Series({column: 0 if column in COUNT_KPIS else np.nan for column in self.aggregates.columns},
+                         dtype=object)
+
+    def impact_index(self, scientist=None):
+        """ImpactIndex over one scientist's publications, or all of them."""
+        key = None if scientist is None else scientist_key(scientist)
+        index = self._impact_index.get(key)
+        if index is None:
+            return ImpactIndex(self.publications_impact_df.iloc[0:0])
+        return index
+
+    @staticmethod
+    def _prepare_companies(companies_df):
+        companies_df = companies_df.dropna(subset=["Scientist", "Company", "Start Year", "End Year / Current"]).copy()
+        companies_df["End Year"] = companies_df["End Year / Current"].replace("Current", pd.Timestamp.now().year)
+        companies_df["Start Year"] = pd.to_numeric(companies_df["Start Year"], errors='coerce')
+        companies_df["End Year"] = pd.to_numeric(companies_df["End Year"], errors='coerce')
+        companies_df["Start Year"] = pd.to_datetime(companies_df["Start Year"], format="%Y", errors='coerce')
+        companies_df["End Year"] = pd.to_datetime(companies_df["End Year"], format="%Y", errors='coerce')
+        return companies_df.dropna(subset=["Start Year", "End Year"])
+
+    @classmethod
+    def load(cls, path):
+        digest = workbook_hash(path)
+        return cls(digest, load_workbook(path, digest))
+
+
+class DatasetManager:
+    """Holds the current Dataset and reloads it when the workbook changes.
+
+    Readers take ``manager.current`` once per request and use that object
+    throughout, so a reload swapping in a new Dataset mid-request is never seen
+    as a mix of old and new frames.
+    """
+
+    def __init__(self, path, lazy=False):
+        self.path = path
+        self._stat = None
+        self._current = None
+        self._load_lock = threading.Lock()
+        self._thread = None
+        self._reload_callbacks = []
+        # A fork taken mid-load would leave the child's copy of the lock held.
+        os.register_at_fork(after_in_child=self._reset_load_lock)
+        if not lazy:
+            self.load()
+
+    def _reset_load_lock(self):
+        self._load_lock = threading.Lock()
+
+    def _file_stat(self):
+        st = os.stat(self.path)
+        return st.st_mtime_ns, st.st_size
+
+    @property
+    def ready(self):
+        return self._current is not None
+
+    @property
+    def current(self):
+        """The loaded Dataset; the first access waits for (or does) the initial load."""
+        if self._current is None:
+            self.load()
+        return self._current
+
+    def load(self):
+        """Load the workbook unless a Dataset is already loaded."""
+        with self._load_lock:
+            if self._current is None:
+                stat = self._file_stat()
+                self._current = Dataset.load(self.path)
+                self._stat = stat
+                logger.info("Loaded workbook version %s", self._current.version[:12])
+
+    def reload(self):
+        """Load the workbook if it changed on disk. Returns True on swap."""
+        if self._current is None:
+            return False
+        stat = self._file_stat()
+        if stat == self._stat:
+            return False
+        dataset = Dataset.load(self.path)
+        self._stat = stat
+        if dataset.version == self._current.version:
+            return False
+        self._current = dataset
+        logger.info("Loaded workbook version %s", dataset.version[:12])
+        self._notify(dataset)
+        return True
+
+    def on_reload(self, callback):
+        """Call ``callback(dataset)`` on the watcher thread after each swap to a new version."""
+        self._reload_callbacks.append(callback)
+
+    def _notify(self, dataset):
+        for callback in self._reload_callbacks:
+            try:
+                callback(dataset)
+            except Exception:
+                logger.exception("Reload callback %r failed", callback)
+
+    def _poll(self):
+        if self._current is None:
+            # The initial load failed (the workbook was missing or half-written
+            # at boot), and nothing else retries it while /readyz says not ready.
+            self.load()
+            self._notify(self._current)
+        else:
+            self.reload()
+
+    def _watch(self, interval):
+        while True:
+            time.sleep(interval)
+            try:
+                self._poll()
+            except Exception:
+                # Usually a half-written upload; keep serving the old version and
+                # retry on the next poll.
+                logger.exception("Reloading %s failed", self.path)
+
+    def _start_watcher(self, interval):
+        self._thread = threading.Thread(target=self._watch, args=(interval,), name="workbook-watcher", daemon=True)
+        self._thread.start()
+
+    def watch(self, interval):
+        """Poll the workbook every ``interval`` seconds on a daemon thread.
+
+        Threads do not survive fork, so preforked workers (gunicorn with
+        preload_app) start their own watcher in the child.
+        """
+        if interval <= 0 or self._thread is not None:
+            return
+        self._start_watcher(interval)
+        os.register_at_fork(after_in_child=lambda: self._start_watcher(interval))
@@ -0,0 +1,49 @@
+# Production entry point: gunicorn -c gunicorn.conf.py
+#
+# The app (and the workbook frames) are loaded once in the master process and
+# shared copy-on-write with the forked workers, so memory does not grow with
+# the worker count.
+import gc
+import multiprocessing
+import os
+import shutil
+import tempfile
+
+wsgi_app = "app:server"
+bind = f"0.0.0.0:{os.environ.get('PORT', '10000')}"
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count()))
+# DASHBOARD_PRELOAD_DATA=0 has each worker import the app and warm up on its
+# own instead, e.g. to restart workers independently; each then has its own copy.
+preload_app = os.environ.get("DASHBOARD_PRELOAD_DATA", "1") != "0"
+timeout = 60
+
+# Workers that reloaded a newer workbook hold a private copy of it; recycling
+# them re-forks from the master, which reloads too, and re-shares the frames.
+max_requests = 2000
+max_requests_jitter = 200
+
+# Each worker writes its Prometheus samples here and /metrics sums them. This
+# runs before the preloaded app (and prometheus_client) is imported; samples
+# left over from a previous run must not be summed in.
+metrics_dir = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", os.path.join(tempfile.gettempdir(), "dashboard-metrics")
+)
+shutil.rmtree(metrics_dir, ignore_errors=True)
+os.makedirs(metrics_dir)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
+
+
+def when_ready(server):
+    # Fork the workers only after the preloaded app has loaded the workbook and
+    # pre-rendered the pages, so they share the result. (Forking while the
+    # warm-up thread is importing could also leave a module lock held.)
+    if preload_app:
+        import app
+        app.warmed_up.wait()
+    # Move everything loaded so far out of the garbage collector's reach so that
+    # collections in the workers do not touch (and un-share) those pages.
+    gc.freeze()
@@ -0,0 +1,88 @@
+"""Prometheus metrics and Server-Timing headers.
+
+Callbacks decorated with ``timed`` record a latency histogram labelled with the
+callback name, and each response lists the timed sections it ran in a
+``Server-Timing`` header. Under gunicorn every worker writes its samples to
+PROMETHEUS_MULTIPROC_DIR (set up in gunicorn.conf.py) and /metrics sums them.
+"""
+import functools
+import os
+import time
+from contextlib import contextmanager
+
+from flask import g, has_request_context
+from prometheus_client import (CONTENT_TYPE_LATEST, REGISTRY, CollectorRegistry, Counter, Gauge,
+                               Histogram, generate_latest, multiprocess)
+
+# Seconds; callbacks range from sub-millisecond table pages to full page renders.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+CALLBACK_SECONDS = Histogram(
+    "dashboard_callback_duration_seconds", "Time spent in a Dash callback.", ["callback"],
+    buckets=LATENCY_BUCKETS
+)
+WORKBOOK_LOADS = Counter(
+    "dashboard_workbook_loads_total",
+    "Workbook loads, by source: 'excel' (parsed with pd.read_excel) or 'snapshot'.", ["source"]
+)
+WORKBOOK_LOAD_SECONDS = Histogram(
+    "dashboard_workbook_load_duration_seconds", "Time to load the workbook sheets.", ["source"],
+    buckets=LATENCY_BUCKETS
+)
+RENDER_CACHE_LOOKUPS = Counter(
+    "dashboard_render_cache_lookups_total", "Render cache lookups, by memoized function and result.",
+    ["function", "result"]
+)
+STARTUP_SECONDS = Gauge(
+    "dashboard_startup_seconds",
+    "Seconds from process start until the dataset was loaded and pages pre-rendered.",
+    multiprocess_mode="liveall"
+)
+
+
+def _server_timing(name, seconds):
+    if has_request_context():
+        g.setdefault("server_timing", []).append((name, seconds))
+
+
+@contextmanager
+def section(name, histogram=None, **labels):
+    """Time a block, observing ``histogram`` (if any) and adding it to Server-Timing."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        if histogram is not None:
+            histogram.labels(**labels).observe(elapsed)
+        _server_timing(name, elapsed)
+
+
+def timed(func):
+    """Decorator recording ``func``'s duration under its name."""
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        with section(func.__name__, CALLBACK_SECONDS, callback=func.__name__):
+            return func(*args, **kwargs)
+
+    return wrapper
+
+
+def add_server_timing(response):
+    """after_request hook writing the timed sections of this request."""
+    timings = g.pop("server_timing", None)
+    if timings:
+        response.headers.add("Server-Timing", ", ".join(
+            f"{name};dur={seconds * 1000:.1f}" for name, seconds in timings
+        ))
+    return response
+
+
+def exposition():
+    """(body, content type) for the /metrics endpoint."""
+    if "PROMETHEUS_MULTIPROC_DIR" in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry), CONTENT_TYPE_LATEST
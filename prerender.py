@@ -0,0 +1,274 @@
+"""Pre-rendered callback responses, built offline and served as static JSON.
+
+``python -m prerender`` renders every server callback whose inputs are all
+discrete (the page URL, dropdown options and slider steps) for every
+combination of their values against the current workbook, and writes the
+``/_dash-update-component`` response bodies to
+``<DASHBOARD_PRERENDER_DIR>/<dataset version>/`` (default ``.prerendered/``),
+with a manifest of their ETags and the app settings they were built with.
+
+``install(app, version, settings)`` answers callback requests that match a
+file of the current dataset version straight from disk, without running the
+callback, and serves the files under ``/_prerendered/<version>/<file>`` as
+immutable, so a CDN or reverse proxy can cache them. Requests with no file (a
+cleared dropdown, table paging, another workbook version, a build made with
+other settings) run the callback as usual.
+"""
+import argparse
+import hashlib
+import itertools
+import json
+import logging
+import os
+import shutil
+import time
+
+from flask import Response, abort, request
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+PRERENDER_DIR = os.environ.get("DASHBOARD_PRERENDER_DIR", ".prerendered")
+MANIFEST = "manifest.json"
+URL = "/_prerendered/"
+# Set on the build's own requests, which must run the callbacks.
+BUILD_ENVIRON = "prerender.build"
+
+
+def version_dir(version):
+    return version[:12]
+
+
+def response_name(output, inputs, state):
+    """File name for a callback request, from its outputs and input/state values."""
+    values = [item.get("value") for item in list(inputs) + list(state or [])
+              if isinstance(item, dict)]
+    key = json.dumps([output, values], sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(key.encode()).hexdigest()[:32] + ".json"
+
+
+class Manifests:
+    """The manifest of each version directory, reread when a build replaces it."""
+
+    def __init__(self, directory, settings):
+        self.directory = directory
+        self.settings = settings
+        self._cached = {}
+
+    def etags(self, version):
+        """{file name: ETag} for ``version``, or None if it was not built with ``settings``."""
+        path = os.path.join(self.directory, version, MANIFEST)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        cached = self._cached.get(version)
+        if cached is None or cached[0] != mtime:
+            with open(path) as f:
+                manifest = json.load(f)
+            if manifest["settings"] == self.settings:
+                cached = (mtime, manifest["etags"])
+            else:
+                logger.warning("Not serving %s: built with settings %s", path, manifest["settings"])
+                cached = (mtime, None)
+            # Only the live version is looked up, so one entry is enough.
+            self._cached = {version: cached}
+        return cached[1]
+
+
+def install(app, version, settings, directory=PRERENDER_DIR):
+    """Serve pre-rendered responses for the dataset version ``version()`` returns.
+
+    ``settings`` is a JSON-able dict of the options that change callback
+    responses; only builds made with the same values are served.
+    """
+    server = app.server
+    manifests = Manifests(directory, settings)
+    endpoint = app.config.routes_pathname_prefix + "_dash-update-component"
+
+    def read(version_name, name, etag):
+        with metrics.section("prerendered"):
+            with open(os.path.join(directory, version_name, name), "rb") as f:
+                body = f.read()
+        response = Response(body, mimetype="application/json")
+        response.set_etag(etag)
+        return response
+
+    @server.before_request
+    def serve_prerendered():
+        # Background job polls carry their job in the query string and new
+        # background jobs must start one, so only plain calls are answered.
+        if request.method != "POST" or request.path != endpoint or request.query_string:
+            return None
+        if request.environ.get(BUILD_ENVIRON):
+            return None
+        payload = request.get_json(silent=True) or {}
+        output = payload.get("output")
+        callback = app.callback_map.get(output)
+        if callback is None or callback.get("background"):
+            return None
+        version_name = version_dir(version())
+        etags = manifests.etags(version_name)
+        if not etags:
+            return None
+        name = response_name(output, payload.get("inputs", []), payload.get("state", []))
+        etag = etags.get(name)
+        if etag is None:
+            return None
+        response = read(version_name, name, etag)
+        response.headers["Content-Location"] = f"{URL}{version_name}/{name}"
+        return response
+
+    @server.route(URL + "<version_name>/<name>")
+    def prerendered_file(version_name, name):
+        etags = manifests.etags(version_name)
+        if not etags or name not in etags:
+            abort(404)
+        response = read(version_name, name, etags[name])
+        # The path includes the dataset version, so its content never changes.
+        response.cache_control.public = True
+        response.cache_control.max_age = 31536000
+        response.cache_control.immutable = True
+        return response.make_conditional(request)
+
+
+# --- Build ---
+
+def _find_components(layout, found):
+    """Collect the props of every component with an id in a serialized layout."""
+    if isinstance(layout, list):
+        for child in layout:
+            _find_components(child, found)
+    elif isinstance(layout, dict):
+        props = layout.get("props")
+        if isinstance(props, dict):
+            if isinstance(props.get("id"), str):
+                found[props["id"]] = dict(props, type=layout.get("type"))
+            _find_components(props.get("children"), found)
+        else:
+            for value in layout.values():
+                _find_components(value, found)
+
+
+def input_values(component, prop):
+    """Every value ``prop`` can take, or None if it is not a discrete input."""
+    if component is None or prop != "value":
+        return None
+    if component["type"] == "Dropdown" and not component.get("multi"):
+        values = [option["value"] if isinstance(option, dict) else option
+                  for option in component.get("options") or []]
+    elif component["type"] == "Slider" and component.get("step"):
+        start, stop, step = component["min"], component["max"], component["step"]
+        values = [start + i * step for i in range(int(round((stop - start) / step)) + 1)]
+    else:
+        return None
+    if component.get("value") not in values:
+        values.append(component.get("value"))
+    return values
+
+
+def _payload(output, callback, values):
+    outputs = [dict(zip(("id", "property"), prop_id.rsplit(".", 1)))
+               for prop_id in output.strip(".").split("...")]
+    return {
+        "output": output,
+        "outputs": outputs if len(outputs) > 1 else outputs[0],
+        "inputs": [dict(inp, value=value) for inp, value in zip(callback["inputs"], values)],
+        "changedPropIds": [],
+        "state": [],
+    }
+
+
+def build(app, version, settings, pages, location="url", directory=PRERENDER_DIR,
+          max_combinations=20000):
+    """Render every discrete callback of ``app`` into ``directory``; returns the file count.
+
+    ``pages`` are the pathnames of the ``dcc.Location`` with id ``location``;
+    the components whose values are enumerated are taken from those pages.
+    Callbacks with State, or more than ``max_combinations`` combinations, are
+    skipped.
+    """
+    client = app.server.test_client()
+    endpoint = app.config.routes_pathname_prefix + "_dash-update-component"
+    version_name = version_dir(version)
+    staging = os.path.join(directory, version_name + ".tmp")
+    shutil.rmtree(staging, ignore_errors=True)
+    os.makedirs(staging)
+
+    components = {location: {"type": "Location", "value": None}}
+    _find_components(client.get(app.config.routes_pathname_prefix + "_dash-layout").get_json(), components)
+    etags = {}
+
+    def render(output, callback, values):
+        payload = _payload(output, callback, values)
+        response = client.post(endpoint, json=payload, environ_overrides={BUILD_ENVIRON: True})
+        if response.status_code != 200:
+            # 204 is PreventUpdate; nothing to serve for those values.
+            return None
+        name = response_name(output, payload["inputs"], payload["state"])
+        with open(os.path.join(staging, name), "wb") as f:
+            f.write(response.data)
+        etags[name] = hashlib.sha256(response.data).hexdigest()[:32]
+        return response
+
+    # Pages first: they hold the dropdowns and sliders the other callbacks read.
+    for output, callback in app.callback_map.items():
+        inputs = [(inp["id"], inp["property"]) for inp in callback["inputs"]]
+        if inputs == [(location, "pathname")] and not callback["state"]:
+            for pathname in pages:
+                response = render(output, callback, [pathname])
+                if response is not None:
+                    _find_components(response.get_json(), components)
+
+    for output, callback in app.callback_map.items():
+        if callback.get("background") or callback["state"]:
+            continue
+        if [(inp["id"], inp["property"]) for inp in callback["inputs"]] == [(location, "pathname")]:
+            continue
+        choices = [input_values(components.get(inp["id"]), inp["property"]) for inp in callback["inputs"]]
+        if any(values is None for values in choices):
+            continue
+        name = callback["callback"].__name__
+        count = 1
+        for values in choices:
+            count *= len(values)
+        if count > max_combinations:
+            logger.warning("Skipping %s: %d combinations", name, count)
+            continue
+        start = time.perf_counter()
+        for values in itertools.product(*choices):
+            render(output, callback, list(values))
+        logger.info("Rendered %s: %d combinations in %.1f s", name, count, time.perf_counter() - start)
+
+    with open(os.path.join(staging, MANIFEST), "w") as f:
+        json.dump({"version": version, "settings": settings, "etags": etags}, f)
+
+    # Swap the finished build in and drop other versions, which no longer match
+    # the workbook.
+    for entry in os.listdir(directory):
+        if os.path.isfile(os.path.join(directory, entry, MANIFEST)) and entry != os.path.basename(staging):
+            shutil.rmtree(os.path.join(directory, entry))
+    os.rename(staging, os.path.join(directory, version_name))
+    return len(etags)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--out", default=PRERENDER_DIR, help="output directory (default: %(default)s)")
+    parser.add_argument("--max-combinations", type=int, default=20000,
+                        help="skip callbacks with more input combinations (default: %(default)s)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    import app
+    dataset = app.dataset.current
+    start = time.perf_counter()
+    count = build(app.app, dataset.version, app.RESPONSE_SETTINGS, app.PAGES, directory=args.out,
+                  max_combinations=args.max_combinations)
+    logger.info("Wrote %d responses for workbook version %s to %s in %.1f s",
+                count, version_dir(dataset.version), args.out, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    main()
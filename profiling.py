@@ -0,0 +1,67 @@
+"""Opt-in profiling of live callback requests.
+
+Set DASHBOARD_PROFILE_DIR to profile a random DASHBOARD_PROFILE_RATE fraction
+(default 0.01) of ``/_dash-update-component`` requests with cProfile. Each
+profile is written to ``<dir>/<callback>/<time>-<pid>-<n>.pstats``; read it with
+``python -m pstats`` or snakeviz. When the variable is unset no hooks are
+registered, so requests pay nothing.
+"""
+import cProfile
+import itertools
+import logging
+import os
+import random
+import re
+import threading
+import time
+
+from flask import g, request
+
+logger = logging.getLogger(__name__)
+
+
+def _callback_name(app):
+    payload = request.get_json(silent=True) or {}
+    output = payload.get("output", "")
+    callback = app.callback_map.get(output, {}).get("callback")
+    if callback is not None:
+        return callback.__name__
+    return re.sub(r"[^A-Za-z0-9_.-]+", "_", output).strip("_.") or "unknown"
+
+
+def install(app):
+    directory = os.environ.get("DASHBOARD_PROFILE_DIR")
+    if not directory:
+        return
+    rate = float(os.environ.get("DASHBOARD_PROFILE_RATE", "0.01"))
+    # One profile at a time per process: concurrent requests would otherwise
+    # stack profilers (and Python 3.12+ allows only one active at once).
+    busy = threading.Lock()
+    sequence = itertools.count()
+    server = app.server
+
+    @server.before_request
+    def start_profile():
+        if not request.path.endswith("/_dash-update-component") or random.random() >= rate:
+            return
+        if not busy.acquire(blocking=False):
+            return
+        g.profiler = cProfile.Profile()
+        g.profiler.enable()
+
+    @server.teardown_request
+    def stop_profile(exc):
+        profiler = g.pop("profiler", None)
+        if profiler is None:
+            return
+        profiler.disable()
+        busy.release()
+        callback_dir = os.path.join(directory, _callback_name(app))
+        filename = f"{time.strftime('%Y%m%dT%H%M%S')}-{os.getpid()}-{next(sequence)}.pstats"
+        try:
+            os.makedirs(callback_dir, exist_ok=True)
+            profiler.dump_stats(os.path.join(callback_dir, filename))
+        except OSError:
+            logger.exception("Writing profile to %s failed", callback_dir)
+
+    logger.info("Profiling %.1f%% of callback requests into %s", rate * 100, directory)
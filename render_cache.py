@@ -0,0 +1,67 @@
+"""Bounded LRU cache for rendered callback outputs.
+
+Callback outputs depend only on their inputs and the loaded dataset, so they are
+memoized under (callback name, inputs, dataset version). The app clears the
+cache when a reload swaps in a new version, whose keys never match the old ones.
+Hits and misses are counted in metrics.RENDER_CACHE_LOOKUPS.
+"""
+import functools
+import threading
+import time
+from collections import OrderedDict
+
+import metrics
+
+_MISSING = object()
+
+
+class RenderCache:
+    def __init__(self, version, maxsize=256, ttl=600):
+        self._version = version
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            return _MISSING
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def memoize(self, func):
+        """Decorator caching ``func``'s return value per inputs and dataset version."""
+        if self.maxsize <= 0:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args):
+            try:
+                key = (func.__name__, args, self._version())
+                hash(key)
+            except TypeError:
+                return func(*args)
+            value = self.get(key)
+            hit = value is not _MISSING
+            metrics.RENDER_CACHE_LOOKUPS.labels(function=func.__name__, result="hit" if hit else "miss").inc()
+            if not hit:
+                value = func(*args)
+                self.put(key, value)
+            return value
+
+        return wrapper
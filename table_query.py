@@ -0,0 +1,121 @@
+"""Server-side paging, sorting and filtering for DataTables.
+
+Tables using page_action/sort_action/filter_action='custom' send their state to
+a callback, which answers with just the visible page. filter_query follows the
+DataTable filter syntax, e.g. ``{Year} >= 2015 && {Organization} contains "AACR"``.
+As in native filtering, text comparisons are case-sensitive unless the operator
+has an ``i`` prefix (``icontains``, ``ieq``); ``s`` marks them sensitive.
+"""
+import math
+
+import pandas as pd
+
+OPERATORS = [
+    ["ge ", ">="],
+    ["le ", "<="],
+    ["lt ", "<"],
+    ["gt ", ">"],
+    ["ne ", "!="],
+    ["eq ", "="],
+    ["contains "],
+    ["datestartswith "],
+]
+
+
+def split_filter_part(filter_part):
+    # The operator (with its optional case prefix) directly follows "{column}";
+    # the quoted value after it may itself contain "ne " or "ge ".
+    start = filter_part.find("{")
+    end = filter_part.find("}", start + 1)
+    if start == -1 or end == -1:
+        return None, None, None
+    name = filter_part[start + 1:end]
+    rest = filter_part[end + 1:].lstrip()
+    for case in ("", "i", "s"):
+        for operator_type in OPERATORS:
+            for operator in operator_type:
+                if rest.startswith(case + operator):
+                    value_part = rest[len(case + operator):].strip()
+                    if not value_part:
+                        return None, None, None
+                    v0 = value_part[0]
+                    if v0 == value_part[-1] and v0 in ("'", '"', "`") and len(value_part) > 1:
+                        value = value_part[1:-1].replace("\\" + v0, v0)
+                    else:
+                        try:
+                            value = float(value_part)
+                        except ValueError:
+                            value = value_part
+                    return name, case + operator_type[0].strip(), value
+    return None, None, None
+
+
+def _text(value):
+    # Numbers typed into a filter are parsed as floats; match 2015 as "2015".
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _mask(column, operator, value):
+    if isinstance(column.dtype, pd.CategoricalDtype):
+        # Test each distinct label once, plus a missing value at position -1,
+        # and map the results back to the rows by category code.
+        labels = pd.Series(column.cat.categories).reindex(range(len(column.cat.categories) + 1))
+        hits = _mask(labels, operator, value).to_numpy(dtype=bool)
+        return pd.Series(hits[column.cat.codes.to_numpy()], index=column.index)
+    ignore_case = operator.startswith("i")
+    operator = operator.lstrip("is")
+    numeric = pd.api.types.is_numeric_dtype(column) and isinstance(value, float)
+    if operator == "contains":
+        return column.astype(str).str.contains(_text(value), case=not ignore_case, regex=False, na=False)
+    if operator == "datestartswith":
+        return column.astype(str).str.startswith(_text(value), na=False)
+    if not numeric:
+        # Compare as text, e.g. {Scientist Name} = "Feng Zhang, PhD" or a number typed
+        # into a text column.
+        column = column.astype(str)
+        value = _text(value)
+        if ignore_case:
+            column = column.str.casefold()
+            value = value.casefold()
+    if operator == "eq":
+        return column == value
+    if operator == "ne":
+        return column != value
+    if operator == "lt":
+        return column < value
+    if operator == "le":
+        return column <= value
+    if operator == "gt":
+        return column > value
+    return column >= value
+
+
+def filter_frame(df, filter_query):
+    for filter_part in (filter_query or "").split(" && "):
+        name, operator, value = split_filter_part(filter_part)
+        if name in df.columns:
+            df = df[_mask(df[name], operator, value)]
+    return df
+
+
+def sort_frame(df, sort_by):
+    sort_by = [col for col in sort_by or [] if col["column_id"] in df.columns]
+    if not sort_by:
+        return df
+    return df.sort_values(
+        [col["column_id"] for col in sort_by],
+        ascending=[col["direction"] == "asc" for col in sort_by],
+        kind="stable"
+    )
+
+
+def table_page(df, page_current, page_size, sort_by=None, filter_query=None):
+    """Return (records for the visible page, page_count) after filter and sort."""
+    df = sort_frame(filter_frame(df, filter_query), sort_by)
+    page_size = page_size or 10
+    page_count = max(math.ceil(len(df) / page_size), 1)
+    page_current = min(page_current or 0, page_count - 1)
+    start = page_current * page_size
+    return df.iloc[start:start + page_size].to_dict("records"), page_count
@@ -0,0 +1,42 @@
+import os
+import shutil
+
+import pandas as pd
+import pytest
+
+import datastore
+
+WORKBOOK = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        "assets", "damon_runyon_data_CLEAN.xlsx")
+
+
+def test_write_snapshot_prunes_only_other_snapshots(tmp_path):
+    old = tmp_path / ("a" * 64)
+    old.mkdir()
+    unrelated = tmp_path / "unrelated_app_data"
+    unrelated.mkdir()
+    (unrelated / "keep.txt").write_text("data")
+
+    current = tmp_path / ("b" * 64)
+    datastore._write_snapshot({"Companies": pd.DataFrame({"Company": ["Acme"]})}, str(current))
+
+    assert sorted(os.listdir(tmp_path)) == sorted([current.name, unrelated.name])
+    assert (unrelated / "keep.txt").read_text() == "data"
+
+
+def test_watcher_retries_failed_initial_load(tmp_path, monkeypatch):
+    monkeypatch.setattr(datastore, "SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    workbook = tmp_path / "workbook.xlsx"
+    manager = datastore.DatasetManager(str(workbook), lazy=True)
+    loaded = []
+    manager.on_reload(loaded.append)
+
+    # Missing at boot: the poll fails and the manager stays not ready.
+    with pytest.raises(FileNotFoundError):
+        manager._poll()
+    assert not manager.ready
+
+    shutil.copy(WORKBOOK, workbook)
+    manager._poll()
+    assert manager.ready
+    assert loaded == [manager.current]
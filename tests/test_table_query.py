@@ -0,0 +1,42 @@
+import pandas as pd
+import pytest
+
+from table_query import filter_frame, split_filter_part
+
+
+@pytest.mark.parametrize("filter_part, expected", [
+    ('{Title} contains "lineage x"', ("Title", "contains", "lineage x")),
+    ('{Title} contains "gene editing"', ("Title", "contains", "gene editing")),
+    ('{Title} contains "single cell"', ("Title", "contains", "single cell")),
+    ('{Title} icontains "one <= two"', ("Title", "icontains", "one <= two")),
+    ('{Title} seq "ne eq ge"', ("Title", "seq", "ne eq ge")),
+    ("{Year} >= 2018", ("Year", "ge", 2018.0)),
+    ("{Year}<2018", ("Year", "lt", 2018.0)),
+    ("{Year} ne 2018", ("Year", "ne", 2018.0)),
+    ('{Organization} = "AACR"', ("Organization", "eq", "AACR")),
+    ("{Title} contains ", (None, None, None)),
+    ('Title contains "x"', (None, None, None)),
+])
+def test_split_filter_part(filter_part, expected):
+    assert split_filter_part(filter_part) == expected
+
+
+@pytest.fixture
+def publications():
+    return pd.DataFrame({
+        "Title": ["Gene editing in lineage x", "Single cell atlas", "Protein folding"],
+        "Year": [2015, 2018, 2021],
+    })
+
+
+@pytest.mark.parametrize("filter_query, titles", [
+    ('{Title} contains "gene editing"', []),
+    ('{Title} icontains "gene editing"', ["Gene editing in lineage x"]),
+    ('{Title} contains "lineage x"', ["Gene editing in lineage x"]),
+    ('{Title} contains "Single cell"', ["Single cell atlas"]),
+    ('{Title} contains "single cell" && {Year} >= 2018', []),
+    ('{Title} icontains "single cell" && {Year} >= 2018', ["Single cell atlas"]),
+    ('{Year} contains 2015', ["Gene editing in lineage x"]),
+])
+def test_filter_frame_values_containing_operators(publications, filter_query, titles):
+    assert filter_frame(publications, filter_query)["Title"].tolist() == titles